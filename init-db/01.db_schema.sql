@@ -28,6 +28,24 @@ CREATE TABLE IF NOT EXISTS dim_holiday (
 );
 
 
+-- Calendar dimension, date_id is the UTC midnight unix timestamp (the
+-- date_key of the kline facts). holiday_countries lists the alpha3 codes
+-- of the countries with a public holiday on that date.
+CREATE TABLE IF NOT EXISTS dim_date (
+    date_id BIGINT PRIMARY KEY,
+    full_date DATE NOT NULL UNIQUE,
+    year SMALLINT NOT NULL,
+    quarter SMALLINT NOT NULL,
+    month SMALLINT NOT NULL,
+    day SMALLINT NOT NULL,
+    iso_year SMALLINT NOT NULL,
+    iso_week SMALLINT NOT NULL,
+    weekday SMALLINT NOT NULL,
+    is_weekend BOOLEAN NOT NULL,
+    holiday_countries CHAR(3)[] NOT NULL DEFAULT '{}'
+);
+
+
 CREATE TABLE IF NOT EXISTS dim_symbol (
     symbol_id INT PRIMARY KEY,
     symbol VARCHAR(20) NOT NULL UNIQUE
@@ -60,6 +78,78 @@ CREATE TABLE IF NOT EXISTS fact_daily_kline (
     taker_buy_base_volume DECIMAL(20,8),
     taker_buy_quote_volume DECIMAL(20,8),
     PRIMARY KEY (date, symbol_id, exchange_id)
+) PARTITION BY RANGE (date);
+
+-- Yearly partitions up to next year; the loader creates later ones on demand.
+DO $$
+DECLARE
+    partition_year INT;
+BEGIN
+    FOR partition_year IN 2017..EXTRACT(YEAR FROM CURRENT_DATE)::INT + 1 LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF fact_daily_kline FOR VALUES FROM (%L) TO (%L)',
+            'fact_daily_kline_y' || partition_year,
+            make_date(partition_year, 1, 1),
+            make_date(partition_year + 1, 1, 1)
+        );
+    END LOOP;
+END $$;
+
+-- Klines at any TIMEFRAME_MAP granularity, open_time in UTC. Monthly
+-- partitions are created by the loader as data arrives.
+CREATE TABLE IF NOT EXISTS fact_kline (
+    open_time TIMESTAMP NOT NULL,
+    symbol_id INT NOT NULL REFERENCES dim_symbol(symbol_id),
+    exchange_id INT NOT NULL REFERENCES dim_exchange(exchange_id),
+    timeframe_id INT NOT NULL REFERENCES dim_timeframe(timeframe_id),
+    open_price DECIMAL(20,8) NOT NULL,
+    high_price DECIMAL(20,8) NOT NULL,
+    low_price DECIMAL(20,8) NOT NULL,
+    close_price DECIMAL(20,8) NOT NULL,
+    volume DECIMAL(20,8) NOT NULL,
+    quote_asset_volume DECIMAL(20,8),
+    number_of_trades INT,
+    taker_buy_base_volume DECIMAL(20,8),
+    taker_buy_quote_volume DECIMAL(20,8),
+    PRIMARY KEY (symbol_id, exchange_id, timeframe_id, open_time)
+) PARTITION BY RANGE (open_time);
+
+-- Weekly (ISO, Monday start) and monthly candles rolled up from
+-- fact_daily_kline. Maintained by the loader; period_start is the first day.
+CREATE TABLE IF NOT EXISTS fact_kline_rollup (
+    period_start DATE NOT NULL,
+    symbol_id INT NOT NULL REFERENCES dim_symbol(symbol_id),
+    exchange_id INT NOT NULL REFERENCES dim_exchange(exchange_id),
+    timeframe_id INT NOT NULL REFERENCES dim_timeframe(timeframe_id),
+    open_price DECIMAL(20,8) NOT NULL,
+    high_price DECIMAL(20,8) NOT NULL,
+    low_price DECIMAL(20,8) NOT NULL,
+    close_price DECIMAL(20,8) NOT NULL,
+    volume DECIMAL(28,8) NOT NULL,
+    quote_asset_volume DECIMAL(28,8),
+    number_of_trades BIGINT,
+    taker_buy_base_volume DECIMAL(28,8),
+    taker_buy_quote_volume DECIMAL(28,8),
+    trading_days INT NOT NULL,
+    PRIMARY KEY (symbol_id, exchange_id, timeframe_id, period_start)
+);
+
+-- Per-symbol calendar year summary, also maintained by the loader.
+CREATE TABLE IF NOT EXISTS fact_symbol_yearly_stats (
+    year INT NOT NULL,
+    symbol_id INT NOT NULL REFERENCES dim_symbol(symbol_id),
+    exchange_id INT NOT NULL REFERENCES dim_exchange(exchange_id),
+    open_price DECIMAL(20,8) NOT NULL,
+    high_price DECIMAL(20,8) NOT NULL,
+    low_price DECIMAL(20,8) NOT NULL,
+    close_price DECIMAL(20,8) NOT NULL,
+    avg_close_price DECIMAL(20,8) NOT NULL,
+    volume DECIMAL(28,8) NOT NULL,
+    quote_asset_volume DECIMAL(28,8),
+    number_of_trades BIGINT,
+    daily_return_stddev DOUBLE PRECISION,
+    trading_days INT NOT NULL,
+    PRIMARY KEY (symbol_id, exchange_id, year)
 );
 
 -- TODO: update those tables lol :)
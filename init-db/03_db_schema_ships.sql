@@ -33,6 +33,7 @@ CREATE TABLE IF NOT EXISTS dim_port (
 
 CREATE TABLE IF NOT EXISTS fact_visit (
     visit_id SERIAL PRIMARY KEY,
+    koper_visit_id INT UNIQUE,
     ship_id INT NOT NULL REFERENCES dim_ship(ship_id),
     port_id INT NOT NULL REFERENCES dim_port(port_id),
     ETA TIMESTAMP NOT NULL,
@@ -0,0 +1,38 @@
+-- Secondary indexes, built after the static data is loaded so the initial
+-- COPYs do not maintain them row by row. Safe to re-run on an existing
+-- database: psql -f init-db/05_indexes.sql
+
+-- Per-symbol chart and rollup scans (symbol_id + date range). The primary
+-- key leads with date, so it cannot serve them; the OHLCV columns are
+-- included so charts are answered by index-only scans.
+CREATE INDEX IF NOT EXISTS fact_daily_kline_symbol_date_idx
+    ON fact_daily_kline (symbol_id, exchange_id, date)
+    INCLUDE (open_price, high_price, low_price, close_price, volume);
+
+-- Cross-symbol time windows. Rows arrive in time order, so BRIN stays a
+-- few pages large while pruning most of each partition.
+CREATE INDEX IF NOT EXISTS fact_daily_kline_date_brin
+    ON fact_daily_kline USING brin (date);
+
+CREATE INDEX IF NOT EXISTS fact_kline_open_time_brin
+    ON fact_kline USING brin (open_time) WITH (pages_per_range = 32);
+
+CREATE INDEX IF NOT EXISTS dim_holiday_date_idx
+    ON dim_holiday (date) INCLUDE (alpha3_code);
+
+CREATE INDEX IF NOT EXISTS fact_visit_ship_id_idx
+    ON fact_visit (ship_id);
+
+-- Port arrival timelines: port_id + ATA range, covering the timetable columns.
+CREATE INDEX IF NOT EXISTS fact_visit_port_ata_idx
+    ON fact_visit (port_id, ATA) INCLUDE (ship_id, ATD, status);
+
+CREATE INDEX IF NOT EXISTS fact_visit_cargo_type_id_idx
+    ON fact_visit (cargo_type_id);
+
+CREATE INDEX IF NOT EXISTS fact_visit_ata_brin
+    ON fact_visit USING brin (ATA);
+
+-- Per-country holiday lookups: holiday_countries @> ARRAY['SVN']::char(3)[]
+CREATE INDEX IF NOT EXISTS dim_date_holiday_countries_gin
+    ON dim_date USING gin (holiday_countries);
@@ -4,8 +4,11 @@ import config
 
 import dash
 import dash_bootstrap_components as dbc
-from flask_login import LoginManager
+from flask import abort, jsonify
+from flask_login import LoginManager, current_user
+from auth.authentication import is_admin
 from auth.user_manager import db, User
+from db.utils.engine import pool_metrics
 
 
 app = dash.Dash(
@@ -38,6 +41,15 @@ db.init_app(server)
 with server.app_context():
     db.create_all()
 
+
+# Pool internals are for operators only.
+@server.route("/health/db-pool")
+def db_pool_health():
+    if not current_user.is_authenticated or not is_admin(current_user.username):
+        abort(403)
+    return jsonify(pool_metrics(config.engine))
+
+
 login_manager = LoginManager()
 login_manager.init_app(server)
 login_manager.login_view = "/login"
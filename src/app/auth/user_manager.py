@@ -1,10 +1,21 @@
 from flask_login import UserMixin
 from config import engine
+from db.utils.engine import get_engine
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy import Table
 from werkzeug.security import generate_password_hash, check_password_hash
 
-db = SQLAlchemy()
+
+# Reuse the process-wide engine (and its pool) instead of creating a second one.
+# Flask-SQLAlchemy has no public hook for an existing engine, so this overrides
+# _make_engine, whose signature is stable across the 3.0/3.1 releases
+# requirements.txt pins; recheck it before raising that pin.
+class SharedEngineSQLAlchemy(SQLAlchemy):
+    def _make_engine(self, bind_key, options, app):
+        return get_engine(options["url"])
+
+
+db = SharedEngineSQLAlchemy()
 
 
 class User(UserMixin, db.Model):
@@ -1,7 +1,7 @@
 import os
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
 from flask_caching import Cache
+from db.utils.engine import get_engine
 
 VERSION = "1.0.0"
 
@@ -14,7 +14,7 @@ DB_HOST = os.getenv("DB_HOST")
 DB_PORT = os.getenv("DB_CONTAINER_PORT")
 
 DB_URI = f"postgresql://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-engine = create_engine(DB_URI)
+engine = get_engine(DB_URI)
 cache = Cache(config={"CACHE_TYPE": "SimpleCache"})
 
 DASH_PORT = os.getenv("DASH_PORT")
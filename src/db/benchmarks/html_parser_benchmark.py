@@ -0,0 +1,76 @@
+import json
+import os
+import timeit
+from typing import Callable, Dict, List
+import pandas as pd
+from src.utils.logger import logger
+from src.pipeline.extract.html_parser import HTML_PARSERS, get_html_parser
+
+FIXTURE_DIR = os.getenv(
+    "HTML_FIXTURE_DIR", os.path.join(os.path.dirname(__file__), "fixtures")
+)
+REPEATS = int(os.getenv("BENCHMARK_REPEATS", "5"))
+KOPER_PANEL_CLASS = "panel panel-accordion"
+
+# Fixtures are rebuilt from init-db/data/country_codes.csv and
+# koper_2026_vsi_podatki.csv in the markup the scrapers parse: the iban.com
+# country table and one PlanPrihodovLadij response per day.
+
+
+def load_fixtures(fixture_dir: str = FIXTURE_DIR) -> Dict[str, List[str]]:
+    with open(os.path.join(fixture_dir, "country_codes.html"), encoding="utf-8") as f:
+        country_codes = [f.read()]
+    with open(
+        os.path.join(fixture_dir, "koper_plan_prihodov.jsonl"), encoding="utf-8"
+    ) as f:
+        koper = [json.loads(line)["table"] for line in f]
+    return {"country_codes": country_codes, "koper_panels": koper}
+
+
+def get_tasks(parser_name: str) -> Dict[str, Callable[[str], list]]:
+    parser = get_html_parser(parser_name)
+    return {
+        "country_codes": parser.extract_table,
+        "koper_panels": lambda html: parser.extract_panels(html, KOPER_PANEL_CLASS),
+    }
+
+
+def run_benchmark(repeats: int = REPEATS) -> pd.DataFrame:
+    fixtures = load_fixtures()
+    rows = []
+    expected = {}
+    for parser_name in HTML_PARSERS:
+        for task_name, task in get_tasks(parser_name).items():
+            pages = fixtures[task_name]
+            results = [task(page) for page in pages]
+            # Every backend has to produce exactly what the bs4 one does.
+            if expected.setdefault(task_name, results) != results:
+                raise RuntimeError(f"{parser_name} output differs on {task_name}")
+
+            seconds = min(
+                timeit.repeat(
+                    lambda: [task(page) for page in pages], number=1, repeat=repeats
+                )
+            )
+            rows.append(
+                {
+                    "parser": parser_name,
+                    "fixture": task_name,
+                    "pages": len(pages),
+                    "records": sum(len(result) for result in results),
+                    "ms": round(seconds * 1000, 2),
+                    "pages_per_s": round(len(pages) / seconds, 1),
+                }
+            )
+
+    report = pd.DataFrame(rows)
+    return report.assign(
+        speedup=lambda d: (
+            d.groupby("fixture")["ms"].transform("max") / d["ms"]
+        ).round(1)
+    )
+
+
+if __name__ == "__main__":
+    report = run_benchmark()
+    logger.info(f"HTML parser benchmark, best of {REPEATS} runs:\n{report.to_string()}")
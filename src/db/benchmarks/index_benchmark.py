@@ -0,0 +1,158 @@
+import os
+import re
+import statistics
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+import pandas as pd
+from src.utils.db import PostgresDB
+from src.utils.logger import logger
+from src.pipeline.constants import INIT_DB_DIR
+
+INDEX_SQL_PATH = os.getenv(
+    "INDEX_SQL_PATH", os.path.join(INIT_DB_DIR, "05_indexes.sql")
+)
+REPEATS = int(os.getenv("BENCHMARK_REPEATS", "5"))
+DROP_INDEXES = os.getenv("BENCHMARK_DROP_INDEXES", "0") == "1"
+
+# The baseline runs without the indexes of INDEX_SQL_PATH (primary keys kept)
+# and the indexed runs with the script applied. Both phases, including their
+# ANALYZE of the indexed tables, are rolled back, so the database is left as
+# it was. Where the indexes already exist the baseline has to drop them, which
+# holds ACCESS EXCLUSIVE locks for the whole phase; that needs
+# BENCHMARK_DROP_INDEXES=1 and is meant for a scratch copy, e.g.
+#   createdb -T dash_analytics dash_analytics_bench
+#   DB_NAME=dash_analytics_bench BENCHMARK_DROP_INDEXES=1 \
+#       python -m src.benchmarks.index_benchmark
+
+# Query shapes used by the loaders, rollup refresh and dashboard lookups.
+BENCHMARK_QUERIES = {
+    "kline_symbol_range": """
+        SELECT date, open_price, high_price, low_price, close_price, volume
+        FROM fact_daily_kline
+        WHERE symbol_id = 1 AND exchange_id = 1 AND date >= DATE '2024-01-01'
+        ORDER BY date
+    """,
+    "kline_watermarks": """
+        SELECT
+            symbol_id,
+            (
+                SELECT MAX(date)
+                FROM fact_daily_kline kline
+                WHERE kline.symbol_id = symbol.symbol_id AND kline.exchange_id = 1
+            )
+        FROM dim_symbol symbol
+    """,
+    "kline_time_window": """
+        SELECT symbol_id, timeframe_id, close_price
+        FROM fact_kline
+        WHERE open_time BETWEEN TIMESTAMP '2025-06-01' AND TIMESTAMP '2025-06-08'
+    """,
+    "holidays_in_range": """
+        SELECT alpha3_code, date
+        FROM dim_holiday
+        WHERE date BETWEEN DATE '2025-12-20' AND DATE '2026-01-05'
+    """,
+    "ship_visits": """
+        SELECT * FROM fact_visit WHERE ship_id = 1 ORDER BY ATA
+    """,
+    "port_arrivals": """
+        SELECT ship_id, ATA, ATD, status
+        FROM fact_visit
+        WHERE port_id = 1 AND ATA >= TIMESTAMP '2026-01-01'
+        ORDER BY ATA
+    """,
+    "visits_by_cargo": """
+        SELECT COUNT(*) FROM fact_visit WHERE cargo_type_id = 1
+    """,
+}
+
+
+# Plans over partitioned tables repeat one scan per partition, so identical
+# child plans (partition suffixes stripped) are collapsed with a count.
+def get_indexes(path: str = INDEX_SQL_PATH) -> Dict[str, str]:
+    with open(path) as file:
+        return dict(
+            re.findall(r"CREATE INDEX IF NOT EXISTS (\w+)\s+ON (\w+)", file.read())
+        )
+
+
+def get_existing_indexes(cursor, names: List[str]) -> List[str]:
+    cursor.execute(
+        "SELECT name FROM unnest(%s::text[]) AS name "
+        "WHERE to_regclass(name) IS NOT NULL",
+        (names,),
+    )
+    return [name for (name,) in cursor.fetchall()]
+
+
+def summarize_plan(plan: Dict[str, Any]) -> str:
+    node = plan["Node Type"]
+    if "Index Name" in plan:
+        node += " using " + re.sub(r"_[ym]\d{4,6}", "", plan["Index Name"])
+    children = Counter(summarize_plan(child) for child in plan.get("Plans", []))
+    if not children:
+        return node
+    summaries = [
+        child if count == 1 else f"{count}x {child}"
+        for child, count in children.items()
+    ]
+    return f"{node} ({', '.join(summaries)})"
+
+
+def explain(cursor, query: str, repeats: int) -> Tuple[float, str]:
+    timings = []
+    for _ in range(repeats):
+        cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {query}")
+        result = cursor.fetchone()[0][0]
+        timings.append(result["Execution Time"])
+    return statistics.median(timings), summarize_plan(result["Plan"])
+
+
+def run_benchmark(
+    db: PostgresDB, repeats: int = REPEATS, drop_indexes: bool = DROP_INDEXES
+) -> pd.DataFrame:
+    indexes = get_indexes()
+    analyze = f"ANALYZE {', '.join(sorted(set(indexes.values())))}"
+    results = {}
+    conn = db.engine.raw_connection()
+    try:
+        with conn.cursor() as cursor:
+            existing = get_existing_indexes(cursor, list(indexes))
+            if existing and not drop_indexes:
+                raise RuntimeError(
+                    f"{len(existing)} benchmarked indexes already exist; run "
+                    "against a scratch copy with BENCHMARK_DROP_INDEXES=1"
+                )
+            for name in existing:
+                cursor.execute(f"DROP INDEX {name}")
+            cursor.execute(analyze)
+            for query_name, query in BENCHMARK_QUERIES.items():
+                results[query_name] = explain(cursor, query, repeats)
+            conn.rollback()
+
+            with open(INDEX_SQL_PATH) as file:
+                cursor.execute(file.read())
+            cursor.execute(analyze)
+            rows = []
+            for query_name, query in BENCHMARK_QUERIES.items():
+                indexed_ms, indexed_plan = explain(cursor, query, repeats)
+                baseline_ms, baseline_plan = results[query_name]
+                rows.append(
+                    {
+                        "query": query_name,
+                        "baseline_ms": round(baseline_ms, 3),
+                        "indexed_ms": round(indexed_ms, 3),
+                        "speedup": round(baseline_ms / max(indexed_ms, 1e-3), 1),
+                        "baseline_plan": baseline_plan,
+                        "indexed_plan": indexed_plan,
+                    }
+                )
+            conn.rollback()
+    finally:
+        conn.close()
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    report = run_benchmark(PostgresDB.from_env())
+    logger.info(f"Index benchmark, median of {REPEATS} runs:\n{report.to_string()}")
@@ -1,7 +1,31 @@
 import os
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+INIT_DB_DIR = os.getenv(
+    "INIT_DB_DIR", os.path.join(BASE_DIR, "..", "..", "..", "init-db")
+)
 OUTPUT_DIR = os.path.join(BASE_DIR, "..", "..", "init-db", "data")
+OUTPUT_FORMAT = os.getenv("PIPELINE_OUTPUT_FORMAT", "csv")
+CHECKPOINT_DIR = os.getenv(
+    "KLINE_CHECKPOINT_DIR", os.path.join(OUTPUT_DIR, "checkpoints")
+)
+KLINE_CACHE_DIR = os.getenv("KLINE_CACHE_DIR", os.path.join(OUTPUT_DIR, "cache"))
+COUNTRY_CODES_SNAPSHOT = os.getenv(
+    "COUNTRY_CODES_SNAPSHOT", os.path.join(OUTPUT_DIR, "cache", "country_codes.json")
+)
+COUNTRY_CODES_TTL = int(os.getenv("COUNTRY_CODES_TTL", str(24 * 60 * 60)))
+HTML_PARSER = os.getenv("HTML_PARSER", "lxml")
+
+BINANCE_MAX_WORKERS = int(os.getenv("BINANCE_MAX_WORKERS", "4"))
+BINANCE_WEIGHT_LIMIT = int(os.getenv("BINANCE_WEIGHT_LIMIT", "6000"))
+KLINE_CHUNK_SIZE = int(os.getenv("KLINE_CHUNK_SIZE", "50000"))
+
+HOLIDAY_POOL_MIN_YEARS = int(os.getenv("HOLIDAY_POOL_MIN_YEARS", "20"))
+
+KOPER_MAX_WORKERS = int(os.getenv("KOPER_MAX_WORKERS", "4"))
+KOPER_MAX_RETRIES = int(os.getenv("KOPER_MAX_RETRIES", "3"))
+KOPER_SYNC_LOOKBACK_DAYS = int(os.getenv("KOPER_SYNC_LOOKBACK_DAYS", "7"))
+KOPER_SYNC_LOOKAHEAD_DAYS = int(os.getenv("KOPER_SYNC_LOOKAHEAD_DAYS", "14"))
 
 PRICE_TYPE_MAP = {
     "open": 1,
@@ -55,3 +79,13 @@ TIMEFRAME_MAP = {
     "1w": 14,
     "1mo": 15,
 }
+
+BINANCE_INTERVAL_MAP = {
+    "1mo": "1M",
+}
+
+KLINE_INTERVALS = [
+    interval
+    for interval in os.getenv("KLINE_INTERVALS", "1h,4h").split(",")
+    if interval in TIMEFRAME_MAP
+]
@@ -1,19 +1,60 @@
 import time
-import csv
 import os
 import requests
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from src.utils.logger import logger
-from typing import Optional, List, Dict, Any
+from src.utils.http import get_session
+from src.utils.frame_io import with_format, write_frame
+from src.pipeline.extract.rate_limiter import BinanceRequestScheduler, scheduler
+from src.pipeline.extract.checkpoint import KlineCheckpoint
+from src.pipeline.extract.cache import KlinePageCache
+from typing import Optional, List, Dict, Iterable, Iterator, Tuple
 from src.pipeline.constants import (
     OUTPUT_DIR,
+    BINANCE_INTERVAL_MAP,
+    BINANCE_MAX_WORKERS,
+    KLINE_CACHE_DIR,
+    KLINE_CHUNK_SIZE,
+    OUTPUT_FORMAT,
 )
 
+KLINE_FIELDS = [
+    "open_time",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "close_time",
+    "quote_asset_volume",
+    "number_of_trades",
+    "taker_buy_base_asset_volume",
+    "taker_buy_quote_asset_volume",
+    "ignore",
+]
+
+KLINE_DTYPES = {
+    "open_time": "int64",
+    "open": "float64",
+    "high": "float64",
+    "low": "float64",
+    "close": "float64",
+    "volume": "float64",
+    "close_time": "int64",
+    "quote_asset_volume": "float64",
+    "number_of_trades": "int64",
+    "taker_buy_base_asset_volume": "float64",
+    "taker_buy_quote_asset_volume": "float64",
+}
+
 
 class BinanceKlineExtractor:
     BASE_URL = "https://api3.binance.com"
     ENDPOINT = "/api/v3/klines"
+    REQUEST_WEIGHT = 2
 
     def __init__(
         self,
@@ -21,42 +62,43 @@ class BinanceKlineExtractor:
         interval: str = "1d",
         limit: int = 500,
         output_folder: str = "./",
+        base_url: Optional[str] = None,
+        request_scheduler: Optional[BinanceRequestScheduler] = None,
+        session: Optional[requests.Session] = None,
+        checkpoint_dir: Optional[str] = None,
+        cache_dir: Optional[str] = KLINE_CACHE_DIR,
+        timeout: float = 30.0,
     ):
+        self.session = session or get_session()
+        self.timeout = timeout
+        self.cache = KlinePageCache(cache_dir) if cache_dir else None
+        self.checkpoint = (
+            KlineCheckpoint(symbol, interval, checkpoint_dir) if checkpoint_dir else None
+        )
+        self.base_url = base_url or self.BASE_URL
+        self.scheduler = request_scheduler or scheduler
         self.symbol = symbol
         self.interval = interval
         self.limit = limit
         self.output_folder = output_folder
         self.params = {
             "symbol": self.symbol,
-            "interval": self.interval,
+            "interval": BINANCE_INTERVAL_MAP.get(self.interval, self.interval),
             "limit": self.limit,
         }
 
-    def timestamp_to_date_format(
-        self, timestamp: int, date_format: str = "%Y-%m-%d"
-    ) -> str:
-        return datetime.fromtimestamp(timestamp / 1000).strftime(date_format)
-
-    def extract_kline_data(self, kline: List) -> Dict[str, Any]:
-        date = self.timestamp_to_date_format(kline[0], "%Y-%m-%d %H:%M:%S")
-
-        return {
-            "date": date,
-            "open": kline[1],
-            "high": kline[2],
-            "low": kline[3],
-            "close": kline[4],
-            "volume": kline[5],
-            "close_time": self.timestamp_to_date_format(kline[6], "%Y-%m-%d %H:%M:%S"),
-            "quote_asset_volume": kline[7],
-            "number_of_trades": kline[8],
-            "taker_buy_base_asset_volume": kline[9],
-            "taker_buy_quote_asset_volume": kline[10],
-        }
+    def parse_klines(self, klines: List[List]) -> pd.DataFrame:
+        columns = np.array(klines, dtype=object).reshape(-1, len(KLINE_FIELDS)).T
+        return pd.DataFrame(
+            {
+                column: columns[KLINE_FIELDS.index(column)].astype(dtype)
+                for column, dtype in KLINE_DTYPES.items()
+            }
+        ).assign(date=lambda d: d["open_time"].astype("datetime64[ms]"))
 
-    def get_data(
+    def iter_pages(
         self, start_time: Optional[int] = None, end_time: Optional[int] = None
-    ) -> List[Dict[str, Any]]:
+    ) -> Iterator[List[List]]:
         params = self.params.copy()
         if start_time:
             params["startTime"] = start_time
@@ -67,29 +109,74 @@ class BinanceKlineExtractor:
 
         logger.info(f"Fetching data for {self.symbol} with interval {self.interval}")
 
-        data = []
-        while True:
-            try:
-                response = requests.get(self.BASE_URL + self.ENDPOINT, params=params)
-                response.raise_for_status()
+        total = 0
+        if self.checkpoint:
+            pages, cursor = self.checkpoint.load(start_time)
+            if cursor:
+                params["startTime"] = cursor
+                for klines in pages:
+                    total += len(klines)
+                    yield klines
 
-                klines = response.json()
-                if not klines:
-                    break
+        while True:
+            klines = self.cache.get(params) if self.cache else None
+            if klines is None:
+                klines = self.scheduler.request(
+                    lambda: self.session.get(
+                        self.base_url + self.ENDPOINT,
+                        params=params,
+                        timeout=self.timeout,
+                    ),
+                    weight=self.REQUEST_WEIGHT,
+                    decode=lambda response: response.json(),
+                )
+                if self.cache:
+                    self.cache.put(params, klines)
 
-                for kline in klines:
-                    data.append(self.extract_kline_data(kline))
+            if not klines:
+                break
 
-                params["startTime"] = klines[-1][0] + 1
-                logger.info(f"Fetched {len(klines)} records, total: {len(data)}")
+            params["startTime"] = klines[-1][0] + 1
+            if self.checkpoint:
+                self.checkpoint.append(klines, start_time, params["startTime"])
+            total += len(klines)
+            logger.info(f"Fetched {len(klines)} records, total: {total}")
 
-                if len(klines) < self.limit:
-                    break
+            yield klines
 
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Request failed: {e}")
+            if len(klines) < self.limit:
                 break
 
+    def clear_checkpoint(self) -> None:
+        # Streaming callers clear the checkpoint only once the fetched pages
+        # are persisted, so a failed load resumes instead of refetching.
+        if self.checkpoint:
+            self.checkpoint.clear()
+
+    def iter_dfs(
+        self,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        chunk_size: int = KLINE_CHUNK_SIZE,
+    ) -> Iterator[pd.DataFrame]:
+        buffer: List[List] = []
+        for klines in self.iter_pages(start_time=start_time, end_time=end_time):
+            buffer.extend(klines)
+            if len(buffer) >= chunk_size:
+                yield self.parse_klines(buffer)
+                buffer = []
+        if buffer:
+            yield self.parse_klines(buffer)
+
+    def get_data(
+        self, start_time: Optional[int] = None, end_time: Optional[int] = None
+    ) -> List[List]:
+        data = [
+            kline
+            for klines in self.iter_pages(start_time=start_time, end_time=end_time)
+            for kline in klines
+        ]
+        self.clear_checkpoint()
         return data
 
     def get_df(
@@ -98,20 +185,23 @@ class BinanceKlineExtractor:
         data = self.get_data(start_time=start_time, end_time=end_time)
         if not data:
             logger.warning("No data fetched, returning empty DataFrame")
-            return pd.DataFrame()
-        return pd.DataFrame(data)
+        return self.parse_klines(data)
 
-    def export_csv(
-        self, data: List[Dict[str, Any]], filename: Optional[str] = None
+    def export(
+        self,
+        df: pd.DataFrame,
+        filename: Optional[str] = None,
+        output_format: str = OUTPUT_FORMAT,
     ) -> str:
-        if not data:
+        if df.empty:
             logger.warning("No data to export")
             return ""
 
         if not filename:
-            start_date = data[0]["date"].split(" ")[0]
-            end_date = data[-1]["date"].split(" ")[0]
-            filename = f"{self.symbol}_{start_date}_to_{end_date}_{self.interval}.csv"
+            start_date = df["date"].iloc[0].strftime("%Y-%m-%d")
+            end_date = df["date"].iloc[-1].strftime("%Y-%m-%d")
+            filename = f"{self.symbol}_{start_date}_to_{end_date}_{self.interval}"
+        filename = with_format(filename, output_format)
 
         if not os.path.exists(self.output_folder):
             os.makedirs(self.output_folder)
@@ -125,15 +215,50 @@ class BinanceKlineExtractor:
                 logger.info("Export cancelled by user")
                 return ""
 
-        with open(filepath, "w", newline="") as f:
-            if data:
-                writer = csv.DictWriter(f, fieldnames=data[0].keys())
-                writer.writeheader()
-                writer.writerows(data)
+        write_frame(df, filepath)
 
         logger.info(f"Data exported to {filepath}")
         return filepath
 
+    def export_csv(self, df: pd.DataFrame, filename: Optional[str] = None) -> str:
+        return self.export(df, filename=filename, output_format="csv")
+
+
+def extract_klines(
+    symbols: Iterable[str],
+    intervals: Iterable[str] = ("1d",),
+    start_time: Optional[int] = None,
+    end_time: Optional[int] = None,
+    limit: int = 500,
+    max_workers: int = BINANCE_MAX_WORKERS,
+    start_times: Optional[Dict[Tuple[str, str], int]] = None,
+    checkpoint_dir: Optional[str] = None,
+    cache_dir: Optional[str] = KLINE_CACHE_DIR,
+) -> Dict[Tuple[str, str], pd.DataFrame]:
+    if end_time is None:
+        end_time = int(time.time() * 1000)
+
+    start_times = start_times or {}
+    jobs = [(symbol, interval) for symbol in symbols for interval in intervals]
+    logger.info(f"Extracting {len(jobs)} kline series with {max_workers} workers")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            job: executor.submit(
+                BinanceKlineExtractor(
+                    symbol=job[0],
+                    interval=job[1],
+                    limit=limit,
+                    checkpoint_dir=checkpoint_dir,
+                    cache_dir=cache_dir,
+                ).get_df,
+                start_time=start_times.get(job, start_time),
+                end_time=end_time,
+            )
+            for job in jobs
+        }
+        return {job: future.result() for job, future in futures.items()}
+
 
 if __name__ == "__main__":
     for symbol in ["BTCUSDT", "ETCUSDT", "XRPUSDT", "BNBUSDT", "SOLUSDT"]:
@@ -143,8 +268,8 @@ if __name__ == "__main__":
 
         start_time = int(datetime(2000, 1, 1).timestamp() * 1000)
 
-        data = extractor.get_data(start_time=start_time)
+        df = extractor.get_df(start_time=start_time)
 
-        if data:
-            extractor.export_csv(data)
-            print(extractor.get_df())
+        if not df.empty:
+            extractor.export(df)
+            print(df)
@@ -0,0 +1,48 @@
+import hashlib
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+from src.pipeline.constants import (
+    KLINE_CACHE_DIR,
+)
+
+
+class KlinePageCache:
+    def __init__(self, cache_dir: str = KLINE_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def _path(self, params: Dict[str, Any]) -> str:
+        key = json.dumps(
+            [params["symbol"], params["interval"], params["startTime"], params["limit"]]
+        )
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.json")
+
+    def get(self, params: Dict[str, Any]) -> Optional[List[List]]:
+        if "startTime" not in params:
+            return None
+
+        path = self._path(params)
+        if not os.path.exists(path):
+            return None
+
+        with open(path, encoding="utf-8") as f:
+            klines = json.load(f)
+        return [kline for kline in klines if kline[0] <= params["endTime"]]
+
+    def put(self, params: Dict[str, Any], klines: List[List]) -> None:
+        # Only full pages of closed candles are immutable; the tail is refetched.
+        if (
+            "startTime" not in params
+            or len(klines) < params["limit"]
+            or klines[-1][6] >= time.time() * 1000
+        ):
+            return
+
+        path = self._path(params)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(klines, f)
+        os.replace(tmp_path, path)
@@ -1,50 +1,69 @@
-import csv
+import json
+import os
+import threading
+import time
 import requests
 import pandas as pd
-from bs4 import BeautifulSoup
 from pathlib import Path
+from typing import Any, Dict, List, Optional
 from src.utils.logger import logger
+from src.utils.http import get_session
+from src.pipeline.extract.html_parser import HtmlParser, get_html_parser
+from src.pipeline.constants import (
+    COUNTRY_CODES_SNAPSHOT,
+    COUNTRY_CODES_TTL,
+    INIT_DB_DIR,
+)
+
+# Column names of init-db/data/country_codes.csv mapped to the iban.com headers.
+FALLBACK_COLUMNS = {
+    "iso_numeric_code": "Numeric",
+    "full_name": "Country",
+    "alpha2_code": "Alpha-2 code",
+    "alpha3_code": "Alpha-3 code",
+}
 
 
 class CountryCodeExtractor:
-    def __init__(self):
+    # Parsed tables shared by every extractor in the process, keyed by url.
+    _memo: Dict[str, Dict[str, Any]] = {}
+    _memo_lock = threading.Lock()
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        ttl: int = COUNTRY_CODES_TTL,
+        snapshot_path: Optional[str] = COUNTRY_CODES_SNAPSHOT,
+        fallback_file: str = os.path.join(INIT_DB_DIR, "data", "country_codes.csv"),
+        html_parser: Optional[HtmlParser] = None,
+    ):
+        self.session = session or get_session()
+        self.html_parser = html_parser or get_html_parser()
         self.url = "https://www.iban.com/country-codes"
-        self.output_file = Path("init-db/data/country_codes.csv")
+        # The scraped table refreshes the same file the offline fallback reads.
+        self.output_file = Path(fallback_file)
+        self.ttl = ttl
+        self.snapshot_path = snapshot_path
+        self.fallback_file = fallback_file
 
     def fetch_html(self):
         logger.info(f"Fetching HTML from {self.url}")
-        response = requests.get(self.url)
+        response = self.session.get(self.url)
         response.raise_for_status()
         return response.text
 
     def extract_table_data(self, html):
-        logger.debug("Parsing HTML to extract table data")
-        soup = BeautifulSoup(html, "html.parser")
-        table = soup.find("table")
-
-        headers = []
-        header_row = (
-            table.find("thead").find("tr") if table.find("thead") else table.find("tr")
-        )
-        if header_row:
-            headers = [th.get_text(strip=True) for th in header_row.find_all("th")]
-            logger.debug(f"Extracted headers: {headers}")
-
-        rows = []
-        table_body = table.find("tbody") if table.find("tbody") else table
-        for row in table_body.find_all("tr"):
-            if row.find("th"):
-                continue
-            cells = [td.get_text(strip=True) for td in row.find_all("td")]
-            if cells and len(cells) == len(headers):
-                rows.append(dict(zip(headers, cells)))
-        return rows
+        logger.debug(f"Parsing HTML with {self.html_parser.name} to extract table data")
+        return self.html_parser.extract_table(html)
 
     def save_to_csv(self, data):
-        with open(self.output_file, "w", newline="", encoding="utf-8") as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=data[0].keys())
-            writer.writeheader()
-            writer.writerows(data)
+        # Written in the layout dim_country is COPYed from in 02_static_data_input.sql.
+        (
+            pd.DataFrame(data)
+            .rename(columns={v: k for k, v in FALLBACK_COLUMNS.items()})
+            .reindex(columns=list(FALLBACK_COLUMNS))
+            .to_csv(self.output_file, index=False)
+        )
         logger.info(f"CSV file saved: {self.output_file}")
 
     def extract_csv(self):
@@ -57,9 +76,89 @@ class CountryCodeExtractor:
             logger.error(f"Extraction failed: {e}")
             raise
 
+    def load_snapshot(self) -> Optional[Dict[str, Any]]:
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return None
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable snapshot {self.snapshot_path}: {e}")
+            return None
+
+    def save_snapshot(self, snapshot: Dict[str, Any]) -> None:
+        if not self.snapshot_path:
+            return
+        os.makedirs(os.path.dirname(self.snapshot_path), exist_ok=True)
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, self.snapshot_path)
+
+    def load_fallback(self) -> List[Dict[str, str]]:
+        logger.warning(f"Falling back to {self.fallback_file}")
+        try:
+            fallback = pd.read_csv(
+                self.fallback_file, dtype=str, keep_default_na=False
+            )
+        except FileNotFoundError as e:
+            raise RuntimeError(
+                f"Country codes unavailable: {self.url} is unreachable, there is "
+                f"no snapshot and no fallback file at {self.fallback_file}"
+            ) from e
+        # The csv stores numeric codes unpadded; iban.com lists them as "010".
+        return (
+            fallback.rename(columns=FALLBACK_COLUMNS)
+            .assign(Numeric=lambda d: d["Numeric"].str.zfill(3))
+            .to_dict("records")
+        )
+
+    def refresh(self, snapshot: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        headers = {}
+        if snapshot and snapshot.get("etag"):
+            headers["If-None-Match"] = snapshot["etag"]
+        if snapshot and snapshot.get("last_modified"):
+            headers["If-Modified-Since"] = snapshot["last_modified"]
+
+        logger.info(f"Fetching HTML from {self.url}")
+        response = self.session.get(self.url, headers=headers, timeout=30)
+        if response.status_code == 304 and snapshot:
+            logger.info("Country codes not modified, reusing snapshot")
+            snapshot = {**snapshot, "fetched_at": time.time()}
+        else:
+            response.raise_for_status()
+            snapshot = {
+                "fetched_at": time.time(),
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "rows": self.extract_table_data(response.text),
+            }
+        self.save_snapshot(snapshot)
+        return snapshot
+
+    def get_rows(self) -> List[Dict[str, str]]:
+        with self._memo_lock:
+            snapshot = self._memo.get(self.url) or self.load_snapshot()
+            if snapshot and time.time() - snapshot["fetched_at"] < self.ttl:
+                self._memo[self.url] = snapshot
+                return snapshot["rows"]
+
+            try:
+                snapshot = self.refresh(snapshot)
+            except requests.RequestException as e:
+                logger.warning(f"Fetching {self.url} failed: {e}")
+                # Offline, a stale snapshot (or the bundled csv) is reused by
+                # this process for another TTL instead of retrying each call.
+                snapshot = {
+                    **(snapshot or {"rows": self.load_fallback()}),
+                    "fetched_at": time.time(),
+                }
+            self._memo[self.url] = snapshot
+            return snapshot["rows"]
+
     def get_df(self) -> pd.DataFrame:
         return (
-            pd.DataFrame(self.extract_table_data(self.fetch_html()))
+            pd.DataFrame(self.get_rows())
             .rename(
                 columns={
                     "Numeric": "country_id",
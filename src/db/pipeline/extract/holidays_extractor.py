@@ -1,14 +1,39 @@
-import csv
 import holidays
-from datetime import date
 import os
+import numpy as np
 import pandas as pd
-from typing import Dict, List
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from itertools import repeat
+from typing import Dict, Iterable, List, Optional
 from src.utils.logger import logger
+from src.utils.frame_io import read_frame, with_format, write_frame
 from src.pipeline.constants import (
+    HOLIDAY_POOL_MIN_YEARS,
     OUTPUT_DIR,
+    OUTPUT_FORMAT,
 )
 
+HOLIDAY_COLUMNS = ["country_code", "date", "name"]
+
+
+def get_country_holidays(
+    country_code: str, years: List[int]
+) -> Dict[str, np.ndarray]:
+    country_holidays = holidays.country_holidays(country_code, years=years)
+    dates = [hol_date for hol_date in country_holidays if isinstance(hol_date, date)]
+    if len(dates) != len(country_holidays):
+        logger.warning(f"Skipping non-date holiday keys for {country_code}")
+
+    dates = np.array(sorted(dates), dtype="datetime64[D]")
+    return {
+        "country_code": np.full(len(dates), country_code, dtype=object),
+        "date": dates,
+        "name": np.array(
+            [country_holidays[hol_date] for hol_date in dates.tolist()], dtype=object
+        ),
+    }
+
 
 class HolidayExtractor:
     def __init__(
@@ -16,61 +41,98 @@ class HolidayExtractor:
         years: range = range(2017, 2025),
         output_dir: str = os.path.dirname(os.path.abspath(__file__)),
         output_file: str = "holidays.csv",
+        max_workers: Optional[int] = None,
     ) -> None:
         self.years: range = years
         self.output_dir: str = os.path.abspath(output_dir)
         self.output_file: str = os.path.join(self.output_dir, output_file)
+        self.max_workers: int = max_workers or os.cpu_count() or 1
 
-    def export_csv(self) -> None:
-        supported_countries: List[str] = holidays.utils.list_supported_countries()
-        try:
-            with open(self.output_file, "w", newline="", encoding="utf-8") as csvfile:
-                writer: csv._writer = csv.writer(csvfile)
-                writer.writerow(["country_code", "date", "name"])
-                logger.info("Writing CSV header")
-
-                for country_code in sorted(supported_countries):
-                    country_holidays: Dict[date, str] = holidays.country_holidays(
-                        country_code, years=self.years
-                    )
+    def get_countries(self) -> List[str]:
+        # Supported countries are listed under both alpha-2 and alpha-3 codes;
+        # the alpha-2 ones are enough (and are what dim_country is joined on).
+        supported_countries = holidays.utils.list_supported_countries()
+        return sorted(code for code in supported_countries if len(code) == 2)
 
-                    for hol_date, name in sorted(country_holidays.items()):
-                        if isinstance(hol_date, date):
-                            writer.writerow([country_code, hol_date.isoformat(), name])
-                        else:
-                            logger.warning(
-                                f"Skipping invalid date format for {country_code}: {hol_date} (type: {type(hol_date)})"
-                            )
-        except Exception as e:
-            logger.error(f"Failed to write CSV file {self.output_file}: {str(e)}")
-            raise
-
-        logger.info(f"CSV file generated: {self.output_file}")
-
-    def get_df(self) -> pd.DataFrame:
-        supported_countries: List[str] = holidays.utils.list_supported_countries()
-        rows: List[Dict[str, str]] = []
-
-        for country_code in sorted(supported_countries):
-            country_holidays: Dict[date, str] = holidays.country_holidays(
-                country_code, years=self.years
+    def get_df(self, years: Optional[Iterable[int]] = None) -> pd.DataFrame:
+        years = sorted(set(years if years is not None else self.years))
+        if not years:
+            return pd.DataFrame(
+                {
+                    "country_code": pd.Series(dtype=object),
+                    "date": pd.Series(dtype="datetime64[s]"),
+                    "name": pd.Series(dtype=object),
+                }
             )
 
-            for hol_date, name in sorted(country_holidays.items()):
-                if isinstance(hol_date, date):
-                    rows.append(
-                        {
-                            "country_code": country_code,
-                            "date": hol_date.isoformat(),
-                            "name": name,
-                        }
-                    )
-                else:
-                    logger.warning(
-                        f"Skipping invalid date format for {country_code}: {hol_date} (type: {type(hol_date)})"
+        countries = self.get_countries()
+        # Process start-up and pickling cost about as much as a decade of
+        # holidays, so short ranges (and every incremental extend) run serially.
+        max_workers = 1 if len(years) < HOLIDAY_POOL_MIN_YEARS else self.max_workers
+        logger.info(
+            f"Generating holidays for {len(countries)} countries, years "
+            f"{years[0]}-{years[-1]}, with {max_workers} workers"
+        )
+        if max_workers == 1:
+            results = list(map(get_country_holidays, countries, repeat(years)))
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = list(
+                    executor.map(
+                        get_country_holidays,
+                        countries,
+                        repeat(years),
+                        chunksize=max(1, len(countries) // (max_workers * 4)),
                     )
+                )
+
+        return pd.DataFrame(
+            {
+                column: np.concatenate([result[column] for result in results])
+                for column in HOLIDAY_COLUMNS
+            }
+        ).astype({"date": "datetime64[s]"})
+
+    def extend(
+        self, existing: pd.DataFrame, years: Optional[Iterable[int]] = None
+    ) -> pd.DataFrame:
+        loaded_years = set(pd.to_datetime(existing["date"]).dt.year)
+        missing_years = [
+            year
+            for year in (years if years is not None else self.years)
+            if year not in loaded_years
+        ]
+        if not missing_years:
+            return existing
+
+        logger.info(f"Extending holidays with years {missing_years}")
+        return (
+            pd.concat(
+                [
+                    existing.assign(date=lambda d: pd.to_datetime(d["date"])),
+                    self.get_df(missing_years),
+                ],
+                ignore_index=True,
+            )
+            .sort_values(["country_code", "date"], kind="stable")
+            .reset_index(drop=True)
+        )
+
+    def export(
+        self, output_format: str = OUTPUT_FORMAT, incremental: bool = False
+    ) -> str:
+        output_file = with_format(self.output_file, output_format)
+        if incremental and os.path.exists(output_file):
+            df = self.extend(read_frame(output_file))
+        else:
+            df = self.get_df()
+
+        write_frame(df, output_file)
+        logger.info(f"File generated: {output_file}")
+        return output_file
 
-        return pd.DataFrame(rows, columns=["country_code", "date", "name"])
+    def export_csv(self, incremental: bool = False) -> None:
+        self.export(output_format="csv", incremental=incremental)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,131 @@
+from abc import ABC, abstractmethod
+from bs4 import BeautifulSoup
+from typing import Dict, List
+from src.utils.logger import logger
+from src.pipeline.constants import HTML_PARSER
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+
+class HtmlParser(ABC):
+    name = ""
+
+    # Rows of the first table, as dicts keyed by its header cells. Rows
+    # containing header cells or with a different cell count are skipped.
+    @abstractmethod
+    def extract_table(self, html: str) -> List[Dict[str, str]]: ...
+
+    # Stripped text of every `tag` inside each div whose class list contains
+    # `panel_class` as whole classes (e.g. "panel panel-accordion" matches
+    # class="panel panel-accordion extra"), one list per panel in document order.
+    @abstractmethod
+    def extract_panels(
+        self, html: str, panel_class: str, tag: str = "span"
+    ) -> List[List[str]]: ...
+
+
+class SoupParser(HtmlParser):
+    name = "bs4"
+
+    def extract_table(self, html: str) -> List[Dict[str, str]]:
+        table = BeautifulSoup(html, "html.parser").find("table")
+        if table is None:
+            return []
+
+        header_row = (
+            table.find("thead").find("tr") if table.find("thead") else table.find("tr")
+        )
+        headers = (
+            [th.get_text(strip=True) for th in header_row.find_all("th")]
+            if header_row
+            else []
+        )
+
+        rows = []
+        table_body = table.find("tbody") if table.find("tbody") else table
+        for row in table_body.find_all("tr"):
+            if row.find("th"):
+                continue
+            cells = [td.get_text(strip=True) for td in row.find_all("td")]
+            if cells and len(cells) == len(headers):
+                rows.append(dict(zip(headers, cells)))
+        return rows
+
+    def extract_panels(
+        self, html: str, panel_class: str, tag: str = "span"
+    ) -> List[List[str]]:
+        # Matched by hand: bs4's class_ matching of a multi-class string
+        # differs between versions and from the lxml XPath below.
+        wanted = f" {panel_class} "
+        soup = BeautifulSoup(html, "html.parser")
+        panels = soup.find_all(
+            lambda element: element.name == "div"
+            and wanted in f" {' '.join(element.get('class', []))} "
+        )
+        return [
+            [element.text.strip() for element in panel.find_all(tag)]
+            for panel in panels
+        ]
+
+
+class LxmlParser(HtmlParser):
+    name = "lxml"
+
+    @staticmethod
+    def _stripped_text(element) -> str:
+        # Same as BeautifulSoup's get_text(strip=True).
+        return "".join(text.strip() for text in element.itertext())
+
+    def extract_table(self, html: str) -> List[Dict[str, str]]:
+        table = lxml.html.document_fromstring(html).find(".//table")
+        if table is None:
+            return []
+
+        thead = table.find(".//thead")
+        header_row = (thead if thead is not None else table).find(".//tr")
+        headers = (
+            [self._stripped_text(th) for th in header_row.iterfind(".//th")]
+            if header_row is not None
+            else []
+        )
+
+        rows = []
+        tbody = table.find(".//tbody")
+        for row in (tbody if tbody is not None else table).iterfind(".//tr"):
+            if row.find(".//th") is not None:
+                continue
+            cells = [self._stripped_text(td) for td in row.iterfind(".//td")]
+            if cells and len(cells) == len(headers):
+                rows.append(dict(zip(headers, cells)))
+        return rows
+
+    def extract_panels(
+        self, html: str, panel_class: str, tag: str = "span"
+    ) -> List[List[str]]:
+        panels = lxml.html.document_fromstring(html).xpath(
+            "//div[contains(concat(' ', normalize-space(@class), ' '), "
+            "concat(' ', $panel_class, ' '))]",
+            panel_class=panel_class,
+        )
+        return [
+            [element.text_content().strip() for element in panel.iterfind(f".//{tag}")]
+            for panel in panels
+        ]
+
+
+HTML_PARSERS = {
+    SoupParser.name: SoupParser,
+    LxmlParser.name: LxmlParser,
+}
+
+
+def get_html_parser(name: str = HTML_PARSER) -> HtmlParser:
+    if name not in HTML_PARSERS:
+        raise ValueError(f"Unsupported HTML parser: {name}")
+    if name == LxmlParser.name and lxml is None:
+        logger.warning("lxml is not installed, falling back to html.parser")
+        name = SoupParser.name
+    return HTML_PARSERS[name]()
@@ -0,0 +1,172 @@
+import csv
+import os
+import random
+import time
+import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+from src.utils.logger import logger
+from src.utils.http import get_session
+from src.pipeline.extract.html_parser import HtmlParser, get_html_parser
+from src.pipeline.constants import (
+    KOPER_MAX_RETRIES,
+    KOPER_MAX_WORKERS,
+)
+
+KOPER_FIELDS = [
+    "ticanje",
+    "ladja",
+    "datum",
+    "dolzina",
+    "ugrez",
+    "teza_tovora",
+    "vrsta_tovora",
+    "bt",
+    "agent",
+    "ladjar",
+]
+
+# Panel span positions of each field; span 1 is the accordion icon.
+KOPER_SPAN_INDEX = dict(zip(KOPER_FIELDS, [0, 2, 3, 4, 5, 6, 7, 8, 9, 10]))
+
+Window = Tuple[date, date]
+
+
+class KoperArrivalsExtractor:
+    URL = "https://www.luka-kp.si/wp-admin/admin-ajax.php"
+    ACTION = "PlanPrihodovLadij"
+    PANEL_CLASS = "panel panel-accordion"
+    HEADERS = {
+        "User-Agent": "Mozilla/5.0",
+        "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
+    }
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        html_parser: Optional[HtmlParser] = None,
+        max_workers: int = KOPER_MAX_WORKERS,
+        max_retries: int = KOPER_MAX_RETRIES,
+        window_days: int = 1,
+        backoff_base: float = 1.0,
+        backoff_cap: float = 30.0,
+        timeout: float = 30.0,
+    ):
+        self.session = session or get_session()
+        self.html_parser = html_parser or get_html_parser()
+        self.url = self.URL
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.window_days = window_days
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.timeout = timeout
+        self.failed_windows: List[Window] = []
+
+    @staticmethod
+    def format_date(day: date) -> str:
+        return day.strftime("%d. %m. %Y")
+
+    def get_windows(self, start_date: date, end_date: date) -> Iterator[Window]:
+        window_start = start_date
+        while window_start <= end_date:
+            window_end = min(
+                window_start + timedelta(days=self.window_days - 1), end_date
+            )
+            yield window_start, window_end
+            window_start = window_end + timedelta(days=1)
+
+    def parse_panels(self, html: str) -> List[Dict[str, str]]:
+        return [
+            {
+                field: spans[index] if index < len(spans) else ""
+                for field, index in KOPER_SPAN_INDEX.items()
+            }
+            for spans in self.html_parser.extract_panels(html, self.PANEL_CLASS)
+            if len(spans) >= 10
+        ]
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2**attempt))
+
+    def fetch_window(self, window: Window) -> List[Dict[str, str]]:
+        payload = {
+            "action": self.ACTION,
+            "pDatumOd": self.format_date(window[0]),
+            "pDatumDo": self.format_date(window[1]),
+        }
+        attempt = 0
+        while True:
+            try:
+                response = self.session.post(
+                    self.url, headers=self.HEADERS, data=payload, timeout=self.timeout
+                )
+                response.raise_for_status()
+                return self.parse_panels(response.json()["table"])
+            except (requests.RequestException, ValueError, KeyError) as e:
+                status = getattr(getattr(e, "response", None), "status_code", None)
+                if attempt >= self.max_retries or (
+                    status is not None and status < 500 and status != 429
+                ):
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning(
+                    f"Fetching {payload['pDatumOd']} failed ({e}), "
+                    f"retrying in {delay:.1f}s"
+                )
+                time.sleep(delay)
+                attempt += 1
+
+    def iter_rows(self, start_date: date, end_date: date) -> Iterator[Dict[str, str]]:
+        # At most 2 * max_workers windows are in flight and rows are yielded
+        # in date order as soon as the oldest pending window completes.
+        windows = self.get_windows(start_date, end_date)
+        self.failed_windows = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = deque()
+
+            def submit_next() -> None:
+                window = next(windows, None)
+                if window is not None:
+                    pending.append((window, executor.submit(self.fetch_window, window)))
+
+            for _ in range(self.max_workers * 2):
+                submit_next()
+
+            while pending:
+                window, future = pending.popleft()
+                submit_next()
+                try:
+                    rows = future.result()
+                except Exception as e:
+                    logger.error(f"Skipping {self.format_date(window[0])}: {e}")
+                    self.failed_windows.append(window)
+                    continue
+
+                logger.info(f"{self.format_date(window[0])}: found {len(rows)} ships")
+                yield from rows
+
+    def export_csv(self, start_date: date, end_date: date, output_file: str) -> int:
+        # Rows go to a .partial file that only replaces output_file once every
+        # day was fetched, so an incomplete backfill never looks finished.
+        partial_file = output_file + ".partial"
+        total = 0
+        with open(partial_file, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=KOPER_FIELDS)
+            writer.writeheader()
+            for row in self.iter_rows(start_date, end_date):
+                writer.writerow(row)
+                total += 1
+
+        if self.failed_windows:
+            failed = ", ".join(self.format_date(day) for day, _ in self.failed_windows)
+            raise RuntimeError(
+                f"Fetching Koper arrivals failed for {failed}; "
+                f"{total} ships kept in {partial_file}"
+            )
+
+        os.replace(partial_file, output_file)
+        logger.info(f"Saved {total} ships to {output_file}")
+        return total
@@ -0,0 +1,119 @@
+import random
+import threading
+import time
+import requests
+from typing import Any, Callable, Optional
+from src.utils.logger import logger
+from src.pipeline.constants import (
+    BINANCE_WEIGHT_LIMIT,
+)
+
+
+class BinanceRequestScheduler:
+    WEIGHT_HEADER = "X-MBX-USED-WEIGHT-1M"
+    RATE_LIMIT_STATUSES = (418, 429)
+    WINDOW_SECONDS = 60
+
+    def __init__(
+        self,
+        weight_limit: int = BINANCE_WEIGHT_LIMIT,
+        safety_ratio: float = 0.9,
+        max_retries: int = 5,
+        backoff_base: float = 1.0,
+        backoff_cap: float = 60.0,
+    ):
+        self.weight_budget = int(weight_limit * safety_ratio)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.used_weight = 0
+        self.window_start = self._window_start(time.time())
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _window_start(self, now: float) -> float:
+        return now - now % self.WINDOW_SECONDS
+
+    def acquire(self, weight: int = 1) -> None:
+        while True:
+            with self._lock:
+                now = time.time()
+                if now - self.window_start >= self.WINDOW_SECONDS:
+                    self.window_start = self._window_start(now)
+                    self.used_weight = 0
+
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                elif self.used_weight + weight <= self.weight_budget:
+                    self.used_weight += weight
+                    return
+                else:
+                    wait = self.window_start + self.WINDOW_SECONDS - now
+
+            logger.info(f"Request weight budget reached, waiting {wait:.1f}s")
+            time.sleep(wait)
+
+    def update(self, response: requests.Response) -> None:
+        used_weight = response.headers.get(self.WEIGHT_HEADER)
+        with self._lock:
+            if used_weight is not None and used_weight.isdigit():
+                self.used_weight = int(used_weight)
+
+            if response.status_code in self.RATE_LIMIT_STATUSES:
+                retry_after = self._retry_after(response) or self.WINDOW_SECONDS
+                self.paused_until = max(self.paused_until, time.time() + retry_after)
+
+    def _retry_after(self, response: requests.Response) -> Optional[float]:
+        retry_after = response.headers.get("Retry-After")
+        try:
+            return float(retry_after) if retry_after is not None else None
+        except ValueError:
+            return None
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2**attempt))
+
+    def request(
+        self,
+        send: Callable[[], requests.Response],
+        weight: int = 1,
+        decode: Optional[Callable[[requests.Response], Any]] = None,
+    ) -> Any:
+        # A body that is cut off or fails to decode is retried like a dropped
+        # connection; decode's result is returned in place of the response.
+        attempt = 0
+        while True:
+            self.acquire(weight)
+            try:
+                response = send()
+                self.update(response)
+                if (
+                    response.status_code not in self.RATE_LIMIT_STATUSES
+                    and response.status_code < 500
+                ):
+                    response.raise_for_status()
+                    return decode(response) if decode else response
+                error: Exception = requests.exceptions.HTTPError(
+                    f"{response.status_code} response from {response.url}",
+                    response=response,
+                )
+            except (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+                requests.exceptions.ChunkedEncodingError,
+                requests.exceptions.ContentDecodingError,
+                ValueError,
+            ) as e:
+                error = e
+
+            if attempt >= self.max_retries:
+                logger.error(f"Request failed after {attempt + 1} attempts: {error}")
+                raise error
+
+            delay = self._backoff(attempt)
+            logger.warning(f"Request failed ({error}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+            attempt += 1
+
+
+scheduler = BinanceRequestScheduler()
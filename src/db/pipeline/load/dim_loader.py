@@ -0,0 +1,31 @@
+from datetime import date
+from typing import Optional, Union
+from src.utils.db import PostgresDB
+from src.utils.logger import logger
+from src.pipeline.transform.dim_tables import get_dim_date
+
+DIM_DATE_START = date(2015, 1, 1)
+
+
+def load_dim_date(
+    db: PostgresDB,
+    start_date: Union[str, date] = DIM_DATE_START,
+    end_date: Optional[Union[str, date]] = None,
+) -> int:
+    end_date = end_date or date(date.today().year + 1, 12, 31)
+    holidays = db.run_query(
+        """
+        SELECT alpha3_code, date
+        FROM dim_holiday
+        WHERE date BETWEEN :start_date AND :end_date
+        """,
+        params={"start_date": start_date, "end_date": end_date},
+    )
+    dim_date = get_dim_date(start_date, end_date, output_path=None, holidays=holidays)
+    rows = db.upsert_dataframe(dim_date, "dim_date", key_columns=["date_id"])
+    logger.info(f"Upserted {rows} rows into dim_date")
+    return rows
+
+
+if __name__ == "__main__":
+    load_dim_date(PostgresDB.from_env())
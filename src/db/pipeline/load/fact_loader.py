@@ -0,0 +1,256 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import pandas as pd
+from src.utils.db import PostgresDB
+from src.utils.logger import logger
+from src.pipeline.extract.binance_extractor import BinanceKlineExtractor
+from src.pipeline.load.rollups import refresh_kline_rollups
+from src.pipeline.transform.fact_tables import (
+    add_kline_keys,
+    get_fact_daily_kline,
+    get_fact_kline,
+)
+from src.pipeline.constants import (
+    BINANCE_MAX_WORKERS,
+    CHECKPOINT_DIR,
+    EXCHANGE_MAP,
+    KLINE_CHUNK_SIZE,
+    KLINE_INTERVALS,
+    SYMBOL_MAP,
+    TIMEFRAME_MAP,
+)
+
+DEFAULT_START_TIME = int(datetime(2017, 1, 1, tzinfo=timezone.utc).timestamp() * 1000)
+FACT_DAILY_KLINE_KEYS = ["date", "symbol_id", "exchange_id"]
+FACT_KLINE_KEYS = ["symbol_id", "exchange_id", "timeframe_id", "open_time"]
+
+Series = Tuple[str, str]
+
+
+def ms_to_date(timestamp: int) -> date:
+    return datetime.fromtimestamp(timestamp / 1000, timezone.utc).date()
+
+
+def to_ms(value: datetime) -> int:
+    return int(pd.Timestamp(value).tz_localize("UTC").timestamp() * 1000)
+
+
+def get_kline_watermarks(
+    db: PostgresDB, exchange: str = "Binance"
+) -> Dict[Series, int]:
+    symbols = {symbol_id: symbol for symbol, symbol_id in SYMBOL_MAP.items()}
+    watermarks = db.run_query(
+        """
+        SELECT symbol_id, last_date
+        FROM (
+            SELECT
+                symbol_id,
+                (
+                    SELECT MAX(date)
+                    FROM fact_daily_kline kline
+                    WHERE kline.symbol_id = symbol.symbol_id
+                      AND kline.exchange_id = :exchange_id
+                ) AS last_date
+            FROM dim_symbol symbol
+        ) watermarks
+        WHERE last_date IS NOT NULL
+        """,
+        params={"exchange_id": EXCHANGE_MAP[exchange]},
+    )
+    return {
+        (symbols[row.symbol_id], "1d"): to_ms(row.last_date)
+        for row in watermarks.itertuples()
+        if row.symbol_id in symbols
+    }
+
+
+def get_fact_kline_watermarks(
+    db: PostgresDB, exchange: str = "Binance"
+) -> Dict[Series, int]:
+    symbols = {symbol_id: symbol for symbol, symbol_id in SYMBOL_MAP.items()}
+    timeframes = {
+        timeframe_id: timeframe for timeframe, timeframe_id in TIMEFRAME_MAP.items()
+    }
+    watermarks = db.run_query(
+        """
+        SELECT symbol_id, timeframe_id, last_open_time
+        FROM (
+            SELECT
+                symbol_id,
+                timeframe_id,
+                (
+                    SELECT MAX(open_time)
+                    FROM fact_kline kline
+                    WHERE kline.symbol_id = symbol.symbol_id
+                      AND kline.exchange_id = :exchange_id
+                      AND kline.timeframe_id = timeframe.timeframe_id
+                ) AS last_open_time
+            FROM dim_symbol symbol
+            CROSS JOIN dim_timeframe timeframe
+        ) watermarks
+        WHERE last_open_time IS NOT NULL
+        """,
+        params={"exchange_id": EXCHANGE_MAP[exchange]},
+    )
+    return {
+        (symbols[row.symbol_id], timeframes[row.timeframe_id]): to_ms(
+            row.last_open_time
+        )
+        for row in watermarks.itertuples()
+        if row.symbol_id in symbols and row.timeframe_id in timeframes
+    }
+
+
+def load_kline_series(
+    db: PostgresDB,
+    table_name: str,
+    key_columns: List[str],
+    transform: Callable[[pd.DataFrame], pd.DataFrame],
+    symbol: str,
+    interval: str,
+    start_time: int,
+    end_time: int,
+    chunk_size: int = KLINE_CHUNK_SIZE,
+    use_copy: bool = False,
+    checkpoint_dir: Optional[str] = CHECKPOINT_DIR,
+) -> int:
+    extractor = BinanceKlineExtractor(
+        symbol=symbol, interval=interval, limit=1000, checkpoint_dir=checkpoint_dir
+    )
+    facts = (
+        transform(add_kline_keys(chunk, symbol, interval))
+        for chunk in extractor.iter_dfs(
+            start_time=start_time, end_time=end_time, chunk_size=chunk_size
+        )
+    )
+
+    if use_copy:
+        rows = db.copy_dataframe(facts, table_name)
+        logger.info(f"Copied {rows} {symbol} {interval} rows into {table_name}")
+    else:
+        rows = db.upsert_dataframe(facts, table_name, key_columns=key_columns)
+        logger.info(f"Upserted {rows} {symbol} {interval} rows into {table_name}")
+
+    # The load has committed, so the downloaded pages are no longer needed.
+    extractor.clear_checkpoint()
+    return rows
+
+
+def load_klines(
+    db: PostgresDB,
+    table_name: str,
+    key_columns: List[str],
+    transform: Callable[[pd.DataFrame], pd.DataFrame],
+    series: Iterable[Series],
+    watermarks: Dict[Series, int],
+    incremental: bool,
+    partition_interval: str,
+    start_time: int,
+    end_time: Optional[int],
+    chunk_size: int,
+    max_workers: int,
+) -> Dict[Series, int]:
+    series = list(series)
+    end_time = end_time or int(time.time() * 1000)
+    logger.info(f"Loading {table_name}, watermarks: {watermarks}")
+
+    # Partitions are created up front: DDL on the parent would block the loads.
+    db.ensure_range_partitions(
+        table_name,
+        ms_to_date(min([start_time, *watermarks.values()])),
+        ms_to_date(end_time),
+        interval=partition_interval,
+    )
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            (symbol, interval): executor.submit(
+                load_kline_series,
+                db,
+                table_name,
+                key_columns,
+                transform,
+                symbol,
+                interval,
+                watermarks.get((symbol, interval), start_time),
+                end_time,
+                chunk_size,
+                # A full reload may overwrite rows, so only a series that is
+                # known to be empty is copied without conflict handling.
+                incremental and (symbol, interval) not in watermarks,
+            )
+            for symbol, interval in series
+        }
+        return {key: future.result() for key, future in futures.items()}
+
+
+def load_fact_daily_kline(
+    db: PostgresDB,
+    incremental: bool = True,
+    start_time: int = DEFAULT_START_TIME,
+    end_time: Optional[int] = None,
+    chunk_size: int = KLINE_CHUNK_SIZE,
+    max_workers: int = BINANCE_MAX_WORKERS,
+    refresh_rollups: bool = True,
+) -> int:
+    watermarks = get_kline_watermarks(db) if incremental else {}
+    loaded = load_klines(
+        db,
+        "fact_daily_kline",
+        FACT_DAILY_KLINE_KEYS,
+        get_fact_daily_kline,
+        [(symbol, "1d") for symbol in SYMBOL_MAP],
+        watermarks,
+        incremental,
+        "year",
+        start_time,
+        end_time,
+        chunk_size,
+        max_workers,
+    )
+
+    if refresh_rollups:
+        refresh_kline_rollups(
+            db,
+            {
+                symbol: ms_to_date(watermarks.get((symbol, interval), start_time))
+                for (symbol, interval), rows in loaded.items()
+                if rows
+            },
+        )
+    return sum(loaded.values())
+
+
+def load_fact_kline(
+    db: PostgresDB,
+    intervals: Iterable[str] = KLINE_INTERVALS,
+    incremental: bool = True,
+    start_time: int = DEFAULT_START_TIME,
+    end_time: Optional[int] = None,
+    chunk_size: int = KLINE_CHUNK_SIZE,
+    max_workers: int = BINANCE_MAX_WORKERS,
+) -> int:
+    watermarks = get_fact_kline_watermarks(db) if incremental else {}
+    loaded = load_klines(
+        db,
+        "fact_kline",
+        FACT_KLINE_KEYS,
+        get_fact_kline,
+        [(symbol, interval) for symbol in SYMBOL_MAP for interval in intervals],
+        watermarks,
+        incremental,
+        "month",
+        start_time,
+        end_time,
+        chunk_size,
+        max_workers,
+    )
+    return sum(loaded.values())
+
+
+if __name__ == "__main__":
+    db = PostgresDB.from_env()
+    load_fact_daily_kline(db)
+    load_fact_kline(db)
@@ -0,0 +1,135 @@
+from datetime import date
+from typing import Dict, Optional
+from src.utils.db import PostgresDB
+from src.utils.logger import logger
+from src.pipeline.constants import EXCHANGE_MAP, SYMBOL_MAP, TIMEFRAME_MAP
+
+ROLLUP_PERIODS = {"1w": "week", "1mo": "month"}
+ROLLUP_START_DATE = date(2017, 1, 1)
+
+# Whole periods are recomputed from the start of the one containing :since,
+# so a partially loaded week or month is always rebuilt from all its days.
+REFRESH_KLINE_ROLLUP = """
+INSERT INTO fact_kline_rollup AS target (
+    period_start, symbol_id, exchange_id, timeframe_id,
+    open_price, high_price, low_price, close_price,
+    volume, quote_asset_volume, number_of_trades,
+    taker_buy_base_volume, taker_buy_quote_volume, trading_days
+)
+SELECT
+    date_trunc('{period}', date)::date AS period_start,
+    symbol_id,
+    exchange_id,
+    :timeframe_id,
+    (array_agg(open_price ORDER BY date))[1],
+    MAX(high_price),
+    MIN(low_price),
+    (array_agg(close_price ORDER BY date DESC))[1],
+    SUM(volume),
+    SUM(quote_asset_volume),
+    SUM(number_of_trades),
+    SUM(taker_buy_base_volume),
+    SUM(taker_buy_quote_volume),
+    COUNT(*)
+FROM fact_daily_kline
+WHERE symbol_id = :symbol_id
+  AND exchange_id = :exchange_id
+  AND date >= date_trunc('{period}', CAST(:since AS date))
+GROUP BY 1, 2, 3
+ON CONFLICT (symbol_id, exchange_id, timeframe_id, period_start) DO UPDATE SET
+    open_price = EXCLUDED.open_price,
+    high_price = EXCLUDED.high_price,
+    low_price = EXCLUDED.low_price,
+    close_price = EXCLUDED.close_price,
+    volume = EXCLUDED.volume,
+    quote_asset_volume = EXCLUDED.quote_asset_volume,
+    number_of_trades = EXCLUDED.number_of_trades,
+    taker_buy_base_volume = EXCLUDED.taker_buy_base_volume,
+    taker_buy_quote_volume = EXCLUDED.taker_buy_quote_volume,
+    trading_days = EXCLUDED.trading_days
+WHERE (target.close_price, target.high_price, target.low_price,
+       target.volume, target.trading_days)
+   IS DISTINCT FROM (EXCLUDED.close_price, EXCLUDED.high_price,
+       EXCLUDED.low_price, EXCLUDED.volume, EXCLUDED.trading_days)
+"""
+
+# The day before the first refreshed year is read so its first daily return
+# can be computed, then filtered out again by the outer year bound.
+REFRESH_SYMBOL_YEARLY_STATS = """
+INSERT INTO fact_symbol_yearly_stats AS target (
+    year, symbol_id, exchange_id,
+    open_price, high_price, low_price, close_price, avg_close_price,
+    volume, quote_asset_volume, number_of_trades,
+    daily_return_stddev, trading_days
+)
+SELECT
+    EXTRACT(YEAR FROM date)::int AS year,
+    symbol_id,
+    exchange_id,
+    (array_agg(open_price ORDER BY date))[1],
+    MAX(high_price),
+    MIN(low_price),
+    (array_agg(close_price ORDER BY date DESC))[1],
+    AVG(close_price),
+    SUM(volume),
+    SUM(quote_asset_volume),
+    SUM(number_of_trades),
+    STDDEV_SAMP(daily_return),
+    COUNT(*)
+FROM (
+    SELECT
+        *,
+        close_price / NULLIF(LAG(close_price) OVER (ORDER BY date), 0) - 1
+            AS daily_return
+    FROM fact_daily_kline
+    WHERE symbol_id = :symbol_id
+      AND exchange_id = :exchange_id
+      AND date >= date_trunc('year', CAST(:since AS date)) - INTERVAL '1 day'
+) daily
+WHERE date >= date_trunc('year', CAST(:since AS date))
+GROUP BY 1, 2, 3
+ON CONFLICT (symbol_id, exchange_id, year) DO UPDATE SET
+    open_price = EXCLUDED.open_price,
+    high_price = EXCLUDED.high_price,
+    low_price = EXCLUDED.low_price,
+    close_price = EXCLUDED.close_price,
+    avg_close_price = EXCLUDED.avg_close_price,
+    volume = EXCLUDED.volume,
+    quote_asset_volume = EXCLUDED.quote_asset_volume,
+    number_of_trades = EXCLUDED.number_of_trades,
+    daily_return_stddev = EXCLUDED.daily_return_stddev,
+    trading_days = EXCLUDED.trading_days
+WHERE (target.close_price, target.high_price, target.low_price,
+       target.volume, target.trading_days)
+   IS DISTINCT FROM (EXCLUDED.close_price, EXCLUDED.high_price,
+       EXCLUDED.low_price, EXCLUDED.volume, EXCLUDED.trading_days)
+"""
+
+
+# `since` maps each symbol to the first daily kline a load touched; only
+# those symbols are refreshed. Without it every symbol is rebuilt in full.
+def refresh_kline_rollups(
+    db: PostgresDB,
+    since: Optional[Dict[str, date]] = None,
+    exchange: str = "Binance",
+) -> None:
+    if since is None:
+        since = {symbol: ROLLUP_START_DATE for symbol in SYMBOL_MAP}
+    for symbol, first_date in since.items():
+        params = {
+            "symbol_id": SYMBOL_MAP[symbol],
+            "exchange_id": EXCHANGE_MAP[exchange],
+            "since": first_date,
+        }
+        for timeframe, period in ROLLUP_PERIODS.items():
+            db.execute(
+                REFRESH_KLINE_ROLLUP.format(period=period),
+                {**params, "timeframe_id": TIMEFRAME_MAP[timeframe]},
+                statement_timeout=False,
+            )
+        db.execute(REFRESH_SYMBOL_YEARLY_STATS, params, statement_timeout=False)
+        logger.info(f"Refreshed {symbol} rollups from {first_date}")
+
+
+if __name__ == "__main__":
+    refresh_kline_rollups(PostgresDB.from_env())
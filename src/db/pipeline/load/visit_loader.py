@@ -0,0 +1,82 @@
+from datetime import date, timedelta
+from typing import Optional
+import pandas as pd
+from src.utils.db import PostgresDB
+from src.utils.logger import logger
+from src.pipeline.extract.koper_extractor import KoperArrivalsExtractor
+from src.pipeline.transform.visit_tables import get_koper_visits
+from src.pipeline.constants import (
+    KOPER_SYNC_LOOKAHEAD_DAYS,
+    KOPER_SYNC_LOOKBACK_DAYS,
+)
+
+VISIT_TIMES = ["eta", "ata", "etd", "atd"]
+
+# Follow-up: new visits still need the full regenerate-and-import run, because
+# their dim_ship, dim_port and cargo keys and ATA/ETD/ATD are synthesised by
+# 4import_all_data.py rather than scraped.
+
+
+def update_koper_visits(
+    db: PostgresDB,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    extractor: Optional[KoperArrivalsExtractor] = None,
+) -> int:
+    """Update status and arrival date of visits already in fact_visit.
+
+    New Koper visits are only counted, not inserted: the arrivals plan has no
+    ATA/ETD/ATD or resolved ship, port and cargo keys, so they are added by the
+    full ship import. ETAs are compared by date, because fact_visit holds
+    generated times of day while the plan lists arrivals at midnight; a moved
+    date shifts ETA, ATA, ETD and ATD by the same number of days.
+    """
+    today = date.today()
+    start_date = start_date or today - timedelta(days=KOPER_SYNC_LOOKBACK_DAYS)
+    end_date = end_date or today + timedelta(days=KOPER_SYNC_LOOKAHEAD_DAYS)
+    extractor = extractor or KoperArrivalsExtractor()
+
+    visits = get_koper_visits(extractor.iter_rows(start_date, end_date))
+    if visits.empty:
+        logger.info(f"No Koper visits between {start_date} and {end_date}")
+        return 0
+
+    existing = db.run_query(
+        """
+        SELECT koper_visit_id, status, ETA AS eta, ATA AS ata, ETD AS etd, ATD AS atd
+        FROM fact_visit
+        WHERE koper_visit_id = ANY(:koper_visit_ids)
+        """,
+        params={"koper_visit_ids": visits["koper_visit_id"].tolist()},
+    ).astype({column: "datetime64[ns]" for column in VISIT_TIMES})
+    diff = visits.merge(
+        existing,
+        on="koper_visit_id",
+        how="left",
+        suffixes=("", "_loaded"),
+        indicator=True,
+    )
+    loaded = diff["_merge"] == "both"
+    shift = diff["eta"].dt.normalize() - diff["eta_loaded"].dt.normalize()
+    changed = loaded & (
+        (diff["status"] != diff["status_loaded"]) | (shift != pd.Timedelta(0))
+    )
+
+    updates = diff.loc[changed].assign(eta=diff["eta_loaded"])
+    rows = db.update_dataframe(
+        updates.assign(
+            **{column: updates[column] + shift[changed] for column in VISIT_TIMES}
+        )[["koper_visit_id", "status", *VISIT_TIMES]],
+        "fact_visit",
+        key_columns=["koper_visit_id"],
+    )
+    logger.info(
+        f"Updated Koper visits {start_date} to {end_date}: {len(visits)} fetched, "
+        f"{rows} updated, {int(loaded.sum()) - rows} unchanged, "
+        f"{int((~loaded).sum())} not yet in fact_visit"
+    )
+    return rows
+
+
+if __name__ == "__main__":
+    update_koper_visits(PostgresDB.from_env())
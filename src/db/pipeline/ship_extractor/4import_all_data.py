@@ -52,6 +52,7 @@ def generate_times(date_str):
 df[['ETA','ATA','ETD','ATD']] = df.apply(lambda row: pd.Series(generate_times(row['date'])), axis=1)
 
 # --- Visit ID ---
+df['koper_visit_id'] = df['visit_id']
 df['visit_id'] = range(1, len(df)+1)
 
 # --- Cargo table ---
@@ -177,7 +178,7 @@ port_table = pd.DataFrame([
 ])
 
 # --- Visit ---
-visit_table = df[['visit_id','ship_id','port_id','ETA','ATA','ETD','ATD','status','cargo_type_id']]
+visit_table = df[['visit_id','ship_id','port_id','ETA','ATA','ETD','ATD','status','cargo_type_id','koper_visit_id']]
 
 # --- Ship type ---
 ship_types_data = [
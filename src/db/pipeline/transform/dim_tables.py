@@ -1,46 +1,71 @@
-import csv
 import os
-from datetime import datetime, timedelta
-from typing import Union
+from datetime import datetime
+from typing import Optional, Union
 import pandas as pd
 from src.utils.logger import logger
+from src.utils.frame_io import read_frame, with_format, write_frame
 from src.pipeline.extract.country_code_extractor import CountryCodeExtractor
 from src.pipeline.extract.holidays_extractor import HolidayExtractor
 from src.pipeline.constants import (
     BASE_DIR,
     OUTPUT_DIR,
+    OUTPUT_FORMAT,
 )
 
 
+def get_holiday_countries(holidays: pd.DataFrame) -> pd.Series:
+    return (
+        holidays.assign(date=lambda d: pd.to_datetime(d["date"]))
+        .drop_duplicates(subset=["date", "alpha3_code"])
+        .sort_values("alpha3_code")
+        .groupby("date")["alpha3_code"]
+        .agg(lambda codes: "{" + ",".join(codes) + "}")
+    )
+
+
 def get_dim_date(
     start_date: Union[str, datetime],
     end_date: Union[str, datetime],
-    output_path: str = "dim_date.csv",
-) -> None:
-    if isinstance(start_date, str):
-        start_date = datetime.strptime(start_date, "%Y-%m-%d")
-    if isinstance(end_date, str):
-        end_date = datetime.strptime(end_date, "%Y-%m-%d")
-
-    with open(output_path, mode="w", newline="") as file:
-        writer = csv.writer(file)
-        writer.writerow(["date_id", "full_date"])
+    output_path: Optional[str] = "dim_date.csv",
+    holidays: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
+    dates = pd.date_range(start_date, end_date, freq="D", name="full_date")
+    iso = dates.isocalendar()
+    holiday_countries = (
+        get_holiday_countries(holidays)
+        if holidays is not None
+        else pd.Series(dtype=object)
+    )
 
-        current_date = start_date
-        while current_date <= end_date:
-            unix_ts = int(current_date.timestamp())
-            writer.writerow([unix_ts, current_date.date().isoformat()])
-            current_date += timedelta(days=1)
+    dim_date = pd.DataFrame(
+        {
+            "date_id": dates.astype("datetime64[s]").astype("int64"),
+            "full_date": dates,
+            "year": dates.year,
+            "quarter": dates.quarter,
+            "month": dates.month,
+            "day": dates.day,
+            "iso_year": iso["year"].to_numpy(),
+            "iso_week": iso["week"].to_numpy(),
+            "weekday": iso["day"].to_numpy(),
+            "is_weekend": dates.dayofweek >= 5,
+            "holiday_countries": holiday_countries.reindex(dates, fill_value="{}")
+            .to_numpy(),
+        }
+    )
 
-    logger.info(f"CSV file created at: {output_path}")
+    if output_path:
+        write_frame(dim_date, output_path)
+        logger.info(f"File created at: {output_path}")
+    return dim_date
 
 
 def get_dim_country(output_path: str = "dim_country.csv"):
-    return CountryCodeExtractor().get_df().to_csv(output_path, index=False)
+    return write_frame(CountryCodeExtractor().get_df(), output_path)
 
 
 def get_dim_holiday(output_path: str = "dim_holiday.csv"):
-    return (
+    return write_frame(
         HolidayExtractor()
         .get_df()
         .assign(
@@ -60,8 +85,8 @@ def get_dim_holiday(output_path: str = "dim_holiday.csv"):
             country_id=lambda df: df["country_id"].astype(int),
         )
         .reindex(columns=["holiday_id", "date_id", "country_id", "name"])
-        .reset_index(drop=True)
-        .to_csv(output_path, index=False)
+        .reset_index(drop=True),
+        output_path,
     )
 
 
@@ -72,9 +97,14 @@ if __name__ == "__main__":
     get_dim_date(
         start_date="2015-01-01",
         end_date="2025-12-31",
-        output_path=os.path.join(OUTPUT_DIR, "dim_date.csv"),
+        output_path=with_format(os.path.join(OUTPUT_DIR, "dim_date"), OUTPUT_FORMAT),
+        holidays=read_frame(os.path.join(OUTPUT_DIR, "holidays.csv")),
     )
 
-    get_dim_country(output_path=os.path.join(OUTPUT_DIR, "dim_country.csv"))
+    get_dim_country(
+        output_path=with_format(os.path.join(OUTPUT_DIR, "dim_country"), OUTPUT_FORMAT)
+    )
 
-    get_dim_holiday(output_path=os.path.join(OUTPUT_DIR, "dim_holiday.csv"))
+    get_dim_holiday(
+        output_path=with_format(os.path.join(OUTPUT_DIR, "dim_holiday"), OUTPUT_FORMAT)
+    )
@@ -2,10 +2,13 @@ import pandas as pd
 import os
 import time
 from datetime import datetime
-from src.pipeline.extract.binance_extractor import BinanceKlineExtractor
+from src.pipeline.extract.binance_extractor import extract_klines
+from src.utils.frame_io import with_format, write_frame
 from src.pipeline.constants import (
     BASE_DIR,
+    BINANCE_MAX_WORKERS,
     OUTPUT_DIR,
+    OUTPUT_FORMAT,
     PRICE_TYPE_MAP,
     VOLUME_TYPE_MAP,
     EXCHANGE_MAP,
@@ -13,102 +16,83 @@ from src.pipeline.constants import (
     TIMEFRAME_MAP,
 )
 
+BRIDGE_KEYS = ["date_key", "symbol_key", "exchange_key", "timeframe_key"]
 
-def get_bridge_trade_context(
+KLINE_VALUE_COLUMNS = {
+    "open": "open_price",
+    "high": "high_price",
+    "low": "low_price",
+    "close": "close_price",
+    "volume": "volume",
+    "quote_asset_volume": "quote_asset_volume",
+    "number_of_trades": "number_of_trades",
+    "taker_buy_base_asset_volume": "taker_buy_base_volume",
+    "taker_buy_quote_asset_volume": "taker_buy_quote_volume",
+}
+
+
+def add_kline_keys(
+    df: pd.DataFrame, symbol: str, interval: str, exchange: str = "Binance"
+) -> pd.DataFrame:
+    return df.assign(
+        symbol=symbol,
+        exchange=exchange,
+        timeframe=interval,
+        date_key=lambda d: d["open_time"] // 1000,
+        symbol_key=SYMBOL_MAP[symbol],
+        exchange_key=EXCHANGE_MAP[exchange],
+        timeframe_key=TIMEFRAME_MAP[interval],
+    )
+
+
+def get_klines(
     start_time: int | None = None,
     end_time: int | None = None,
+    interval: str = "1d",
+    max_workers: int = BINANCE_MAX_WORKERS,
+    start_times: dict[str, int] | None = None,
 ) -> pd.DataFrame:
+    frames = [
+        add_kline_keys(df, symbol, timeframe)
+        for (symbol, timeframe), df in extract_klines(
+            SYMBOL_MAP,
+            intervals=[interval],
+            start_time=start_time,
+            end_time=end_time,
+            max_workers=max_workers,
+            start_times={
+                (symbol, interval): symbol_start
+                for symbol, symbol_start in (start_times or {}).items()
+            },
+        ).items()
+    ]
+    return pd.concat(frames, ignore_index=True)
+
+
+def get_bridge_trade_context(klines: pd.DataFrame) -> pd.DataFrame:
     return (
-        pd.concat(
-            [
-                BinanceKlineExtractor(symbol=symbol)
-                .get_df(start_time=start_time, end_time=end_time)
-                .assign(
-                    date_key=lambda d: pd.to_datetime(d["date"])
-                    .astype("int64")
-                    .floordiv(10**9),
-                    symbol=symbol,
-                    exchange="Binance",
-                    timeframe="1d",
-                )
-                .assign(
-                    symbol_key=lambda d: d["symbol"].map(SYMBOL_MAP),
-                    exchange_key=lambda d: d["exchange"].map(EXCHANGE_MAP),
-                    timeframe_key=lambda d: d["timeframe"].map(TIMEFRAME_MAP),
-                )
-                for symbol in SYMBOL_MAP
-            ],
-            ignore_index=True,
-        )
-        .reset_index(drop=True)
+        klines.reset_index(drop=True)
         .assign(bridge_id=lambda d: d.index + 1)
-        .reindex(
-            columns=[
-                "bridge_id",
-                "date_key",
-                "symbol_key",
-                "exchange_key",
-                "timeframe_key",
-            ]
-        )
+        .reindex(columns=["bridge_id", *BRIDGE_KEYS])
     )
 
 
-def get_fact_price(
-    bridge: pd.DataFrame, start_time=None, end_time=None
-) -> pd.DataFrame:
+def get_fact_price(klines: pd.DataFrame, bridge: pd.DataFrame) -> pd.DataFrame:
     return (
-        pd.concat(
-            [
-                BinanceKlineExtractor(symbol=symbol)
-                .get_df(start_time=start_time, end_time=end_time)
-                .melt(
-                    id_vars=["date"],
-                    value_vars=["open", "high", "low", "close"],
-                    var_name="price_type",
-                    value_name="price",
-                )
-                .assign(
-                    date_key=lambda d: pd.to_datetime(d["date"]).astype("int64")
-                    // 10**9,
-                    price_type_key=lambda d: d["price_type"].map(PRICE_TYPE_MAP),
-                    symbol=symbol,
-                    exchange="Binance",
-                    timeframe="1d",
-                )
-                .assign(
-                    symbol_key=lambda d: d["symbol"].map(SYMBOL_MAP),
-                    exchange_key=lambda d: d["exchange"].map(EXCHANGE_MAP),
-                    timeframe_key=lambda d: d["timeframe"].map(TIMEFRAME_MAP),
-                )
-                .merge(
-                    bridge[
-                        [
-                            "bridge_id",
-                            "date_key",
-                            "symbol_key",
-                            "exchange_key",
-                            "timeframe_key",
-                        ]
-                    ],
-                    on=["date_key", "symbol_key", "exchange_key", "timeframe_key"],
-                    how="inner",
-                )
-                for symbol in SYMBOL_MAP
-            ],
-            ignore_index=True,
+        klines.merge(bridge, on=BRIDGE_KEYS, how="inner")
+        .melt(
+            id_vars=["bridge_id"],
+            value_vars=["open", "high", "low", "close"],
+            var_name="price_type",
+            value_name="price",
         )
-        .filter(items=["bridge_id", "price_type_key", "price"])
+        .assign(price_type_key=lambda d: d["price_type"].map(PRICE_TYPE_MAP))
         .reindex(columns=["bridge_id", "price_type_key", "price"])
         .rename(columns={"bridge_id": "bridge_key"})
     )
 
 
-def get_fact_volume(
-    bridge: pd.DataFrame,
-    start_time: int | None = None,
-    end_time: int | None = None,
-) -> pd.DataFrame:
+def get_fact_volume(klines: pd.DataFrame, bridge: pd.DataFrame) -> pd.DataFrame:
     rename_map = {
         "volume": "base_volume",
         "quote_asset_volume": "quote_volume",
@@ -116,123 +100,89 @@ def get_fact_volume(
         "taker_buy_quote_asset_volume": "taker_buy_quote_volume",
     }
     return (
-        pd.concat(
-            [
-                BinanceKlineExtractor(symbol=symbol)
-                .get_df(start_time=start_time, end_time=end_time)
-                .rename(columns=rename_map)
-                .melt(
-                    id_vars=["date"],
-                    value_vars=list(rename_map.values()),
-                    var_name="volume_type",
-                    value_name="volume",
-                )
-                .assign(
-                    date_key=lambda d: pd.to_datetime(d["date"]).astype("int64")
-                    // 10**9,
-                    volume_type_key=lambda d: d["volume_type"].map(VOLUME_TYPE_MAP),
-                    symbol=symbol,
-                    exchange="Binance",
-                    timeframe="1d",
-                )
-                .assign(
-                    symbol_key=lambda d: d["symbol"].map(SYMBOL_MAP),
-                    exchange_key=lambda d: d["exchange"].map(EXCHANGE_MAP),
-                    timeframe_key=lambda d: d["timeframe"].map(TIMEFRAME_MAP),
-                )
-                .merge(
-                    bridge[
-                        [
-                            "bridge_id",
-                            "date_key",
-                            "symbol_key",
-                            "exchange_key",
-                            "timeframe_key",
-                        ]
-                    ],
-                    on=["date_key", "symbol_key", "exchange_key", "timeframe_key"],
-                    how="inner",
-                )
-                for symbol in SYMBOL_MAP
-            ],
-            ignore_index=True,
+        klines.merge(bridge, on=BRIDGE_KEYS, how="inner")
+        .rename(columns=rename_map)
+        .melt(
+            id_vars=["bridge_id"],
+            value_vars=list(rename_map.values()),
+            var_name="volume_type",
+            value_name="volume",
         )
-        .filter(items=["bridge_id", "volume_type_key", "volume"])
+        .assign(volume_type_key=lambda d: d["volume_type"].map(VOLUME_TYPE_MAP))
         .reindex(columns=["bridge_id", "volume_type_key", "volume"])
         .rename(columns={"bridge_id": "bridge_key"})
     )
 
 
-def get_fact_num_trades(
-    bridge: pd.DataFrame,
-    start_time: int | None = None,
-    end_time: int | None = None,
-) -> pd.DataFrame:
+def get_fact_num_trades(klines: pd.DataFrame, bridge: pd.DataFrame) -> pd.DataFrame:
     return (
-        pd.concat(
-            [
-                BinanceKlineExtractor(symbol=symbol)
-                .get_df(start_time=start_time, end_time=end_time)
-                .assign(
-                    date_key=lambda d: pd.to_datetime(d["date"]).astype("int64")
-                    // 10**9,
-                    symbol=symbol,
-                    exchange="Binance",
-                    timeframe="1d",
-                )
-                .assign(
-                    symbol_key=lambda d: d["symbol"].map(SYMBOL_MAP),
-                    exchange_key=lambda d: d["exchange"].map(EXCHANGE_MAP),
-                    timeframe_key=lambda d: d["timeframe"].map(TIMEFRAME_MAP),
-                )
-                .merge(
-                    bridge[
-                        [
-                            "bridge_id",
-                            "date_key",
-                            "symbol_key",
-                            "exchange_key",
-                            "timeframe_key",
-                        ]
-                    ],
-                    on=["date_key", "symbol_key", "exchange_key", "timeframe_key"],
-                    how="inner",
-                )
-                for symbol in SYMBOL_MAP
-            ],
-            ignore_index=True,
-        )
-        .filter(items=["bridge_id", "number_of_trades"])
+        klines.merge(bridge, on=BRIDGE_KEYS, how="inner")
         .reindex(columns=["bridge_id", "number_of_trades"])
         .rename(columns={"bridge_id": "bridge_key"})
     )
 
 
+def get_fact_daily_kline(klines: pd.DataFrame) -> pd.DataFrame:
+    return (
+        klines.rename(
+            columns={
+                **KLINE_VALUE_COLUMNS,
+                "symbol_key": "symbol_id",
+                "exchange_key": "exchange_id",
+            }
+        )
+        .assign(date=lambda d: d["date"].dt.normalize())
+        .reindex(
+            columns=[
+                "date",
+                "symbol_id",
+                "exchange_id",
+                *KLINE_VALUE_COLUMNS.values(),
+            ]
+        )
+    )
+
+
+def get_fact_kline(klines: pd.DataFrame) -> pd.DataFrame:
+    return (
+        klines.rename(
+            columns={
+                **KLINE_VALUE_COLUMNS,
+                "symbol_key": "symbol_id",
+                "exchange_key": "exchange_id",
+                "timeframe_key": "timeframe_id",
+            }
+        )
+        .assign(open_time=lambda d: d["date"])
+        .reindex(
+            columns=[
+                "open_time",
+                "symbol_id",
+                "exchange_id",
+                "timeframe_id",
+                *KLINE_VALUE_COLUMNS.values(),
+            ]
+        )
+    )
+
+
+def get_fact_tables(klines: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    bridge = get_bridge_trade_context(klines)
+    return {
+        "bridge_trade_context": bridge,
+        "fact_price": get_fact_price(klines, bridge),
+        "fact_volume": get_fact_volume(klines, bridge),
+        "fact_num_trades": get_fact_num_trades(klines, bridge),
+    }
+
+
 if __name__ == "__main__":
     BASE_DIR = os.path.dirname(os.path.abspath(__file__))
     OUTPUT_DIR = os.path.join(BASE_DIR, "..", "..", "init-db", "data")
     start_time = int(datetime(2017, 1, 1).timestamp() * 1000)
     end_time = int(time.time() * 1000)
-    bridge = get_bridge_trade_context()
 
-    get_bridge_trade_context(start_time=start_time, end_time=end_time).to_csv(
-        os.path.join(OUTPUT_DIR, "bridge_trade_context.csv"), index=False
-    )
+    klines = get_klines(start_time=start_time, end_time=end_time)
 
-    get_fact_price(
-        bridge=bridge,
-        start_time=start_time,
-        end_time=end_time,
-    ).to_csv(os.path.join(OUTPUT_DIR, "fact_price.csv"), index=False)
-
-    get_fact_volume(
-        bridge=bridge,
-        start_time=start_time,
-        end_time=end_time,
-    ).to_csv(os.path.join(OUTPUT_DIR, "fact_volume.csv"), index=False)
-
-    get_fact_num_trades(
-        bridge=bridge,
-        start_time=start_time,
-        end_time=end_time,
-    ).to_csv(os.path.join(OUTPUT_DIR, "fact_num_trades.csv"), index=False)
+    for name, df in get_fact_tables(klines).items():
+        write_frame(df, with_format(os.path.join(OUTPUT_DIR, name), OUTPUT_FORMAT))
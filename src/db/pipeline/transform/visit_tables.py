@@ -0,0 +1,27 @@
+import pandas as pd
+from typing import Dict, Iterable
+
+KOPER_VISIT_COLUMNS = ["koper_visit_id", "status", "eta"]
+
+
+# The Koper export columns are named one span off: "ugrez" holds
+# "Ticanje: 77330 (Odvezana)" and "vrsta_tovora" holds "Datum: 01.01.2026, 00:00".
+def get_koper_visits(rows: Iterable[Dict[str, str]]) -> pd.DataFrame:
+    return (
+        pd.DataFrame(rows, columns=["ticanje", "ugrez", "vrsta_tovora"])
+        .assign(
+            koper_visit_id=lambda d: pd.to_numeric(d["ticanje"], errors="coerce"),
+            status=lambda d: d["ugrez"].str.extract(r"\((.*?)\)", expand=False),
+            eta=lambda d: pd.to_datetime(
+                d["vrsta_tovora"].str.removeprefix("Datum: "),
+                format="%d.%m.%Y, %H:%M",
+                errors="coerce",
+            ),
+        )
+        .dropna(subset=KOPER_VISIT_COLUMNS)
+        # A visit listed on several days of the window keeps its latest state.
+        .drop_duplicates(subset="koper_visit_id", keep="last")
+        .astype({"koper_visit_id": "int64"})
+        .reindex(columns=KOPER_VISIT_COLUMNS)
+        .reset_index(drop=True)
+    )
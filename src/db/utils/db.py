@@ -1,17 +1,54 @@
-from typing import Any, Dict, List, Optional
+import io
+import itertools
+import os
+import threading
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 import pandas as pd
-from sqlalchemy import create_engine, Table, Column, MetaData, insert, text
+import psycopg2
+from sqlalchemy import Table, Column, MetaData, insert, text
 from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError
+from src.utils.engine import get_engine, pool_metrics
+
+# Bulk loads and rollup refreshes outlast the app's statement timeout, so they
+# lift it for their own transaction only and keep sharing the app's engine.
+NO_STATEMENT_TIMEOUT = "SET LOCAL statement_timeout = 0"
 
 
 class PostgresDB:
-    def __init__(self, user: str, password: str, host: str, port: int, database: str):
+    def __init__(
+        self,
+        user: str,
+        password: str,
+        host: str,
+        port: int,
+        database: str,
+        **engine_overrides: Any,
+    ):
         self.connection_url = (
             f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{database}"
         )
-        self.engine: Engine = create_engine(self.connection_url)
+        self.engine: Engine = get_engine(self.connection_url, **engine_overrides)
         self.metadata = MetaData()
+        self._tables: Dict[str, Table] = {}
+        self._insert_statements: Dict[str, Any] = {}
+        self._partitions: Set[str] = set()
+        self._reflect_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, **engine_overrides: Any) -> "PostgresDB":
+        return cls(
+            user=os.getenv("DB_USER"),
+            password=os.getenv("DB_PASSWORD"),
+            host=os.getenv("DB_HOST"),
+            port=int(os.getenv("DB_CONTAINER_PORT", "5432")),
+            database=os.getenv("DB_NAME"),
+            **engine_overrides,
+        )
+
+    def pool_metrics(self) -> Dict[str, Any]:
+        return pool_metrics(self.engine)
 
     def run_query(
         self, query: str, params: Optional[Dict[str, Any]] = None
@@ -23,9 +60,33 @@ class PostgresDB:
         except SQLAlchemyError as e:
             raise RuntimeError(f"Query failed: {e}")
 
-    def execute(self, query: str, params: Optional[Dict[str, Any]] = None) -> None:
+    def iter_query(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        chunksize: int = 10_000,
+        dtype: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[pd.DataFrame]:
+        try:
+            with self.engine.connect().execution_options(
+                stream_results=True, max_row_buffer=chunksize
+            ) as conn:
+                yield from pd.read_sql(
+                    text(query), conn, params=params, chunksize=chunksize, dtype=dtype
+                )
+        except SQLAlchemyError as e:
+            raise RuntimeError(f"Query failed: {e}")
+
+    def execute(
+        self,
+        query: str,
+        params: Optional[Dict[str, Any]] = None,
+        statement_timeout: bool = True,
+    ) -> None:
         try:
             with self.engine.begin() as conn:
+                if not statement_timeout:
+                    conn.execute(text(NO_STATEMENT_TIMEOUT))
                 conn.execute(text(query), params or {})
         except SQLAlchemyError as e:
             raise RuntimeError(f"Execution failed: {e}")
@@ -38,15 +99,255 @@ class PostgresDB:
         except SQLAlchemyError as e:
             raise RuntimeError(f"Insert DataFrame failed: {e}")
 
+    def _copy_frames(
+        self,
+        cursor,
+        frames: Iterable[pd.DataFrame],
+        table_name: str,
+        columns: List[str],
+        chunksize: int,
+    ) -> int:
+        rows = 0
+        stmt = f"COPY {table_name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+        for df in frames:
+            for start in range(0, len(df), chunksize):
+                buffer = io.StringIO()
+                df[columns].iloc[start : start + chunksize].to_csv(
+                    buffer, index=False, header=False
+                )
+                buffer.seek(0)
+                cursor.copy_expert(stmt, buffer)
+            rows += len(df)
+        return rows
+
+    def _with_columns(
+        self,
+        data: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+        columns: Optional[List[str]],
+    ) -> Tuple[Iterator[pd.DataFrame], List[str]]:
+        frames = iter([data] if isinstance(data, pd.DataFrame) else data)
+        first = next(frames, None)
+        if first is None:
+            return frames, []
+        return itertools.chain([first], frames), columns or list(first.columns)
+
+    def _bulk_load(
+        self,
+        data: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+        table_name: str,
+        columns: Optional[List[str]],
+        chunksize: int,
+        on_conflict: Optional[str] = None,
+        distinct_on: Optional[List[str]] = None,
+    ) -> int:
+        frames, columns = self._with_columns(data, columns)
+        if not columns:
+            return 0
+
+        conn = self.engine.raw_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(NO_STATEMENT_TIMEOUT)
+                if on_conflict is None:
+                    rows = self._copy_frames(
+                        cursor, frames, table_name, columns, chunksize
+                    )
+                else:
+                    staging_table = f"staging_{table_name}"
+                    cursor.execute(
+                        f"CREATE TEMP TABLE {staging_table} "
+                        f"(LIKE {table_name} INCLUDING DEFAULTS) ON COMMIT DROP"
+                    )
+                    rows = self._copy_frames(
+                        cursor, frames, staging_table, columns, chunksize
+                    )
+                    target_columns = ", ".join(columns)
+                    select = f"SELECT {target_columns} FROM {staging_table}"
+                    if distinct_on:
+                        # The last copied row wins when a key appears more than once.
+                        keys = ", ".join(distinct_on)
+                        select = (
+                            f"SELECT DISTINCT ON ({keys}) {target_columns} "
+                            f"FROM {staging_table} ORDER BY {keys}, ctid DESC"
+                        )
+                    cursor.execute(
+                        f"INSERT INTO {table_name} AS target ({target_columns}) "
+                        f"{select} ON CONFLICT {on_conflict}"
+                    )
+            conn.commit()
+            return rows
+        except psycopg2.Error as e:
+            conn.rollback()
+            raise RuntimeError(f"Bulk load into {table_name} failed: {e}")
+        finally:
+            conn.close()
+
+    def copy_dataframe(
+        self,
+        data: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+        table_name: str,
+        columns: Optional[List[str]] = None,
+        on_conflict_do_nothing: bool = False,
+        chunksize: int = 100_000,
+    ) -> int:
+        return self._bulk_load(
+            data,
+            table_name,
+            columns,
+            chunksize,
+            on_conflict="DO NOTHING" if on_conflict_do_nothing else None,
+        )
+
+    def upsert_dataframe(
+        self,
+        data: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+        table_name: str,
+        key_columns: List[str],
+        columns: Optional[List[str]] = None,
+        chunksize: int = 100_000,
+    ) -> int:
+        frames, columns = self._with_columns(data, columns)
+        if not columns:
+            return 0
+
+        update_columns = [column for column in columns if column not in key_columns]
+        assignments = ", ".join(
+            f"{column} = EXCLUDED.{column}" for column in update_columns
+        )
+        target = ", ".join(f"target.{column}" for column in update_columns)
+        excluded = ", ".join(f"EXCLUDED.{column}" for column in update_columns)
+        return self._bulk_load(
+            frames,
+            table_name,
+            columns,
+            chunksize,
+            on_conflict=(
+                f"({', '.join(key_columns)}) DO UPDATE SET {assignments} "
+                f"WHERE ({target}) IS DISTINCT FROM ({excluded})"
+            ),
+            distinct_on=key_columns,
+        )
+
+    def update_dataframe(
+        self,
+        data: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+        table_name: str,
+        key_columns: List[str],
+        columns: Optional[List[str]] = None,
+        chunksize: int = 100_000,
+    ) -> int:
+        frames, columns = self._with_columns(data, columns)
+        if not columns:
+            return 0
+
+        # Only the given columns are staged, so rows need not satisfy the
+        # target's NOT NULL constraints the way upsert_dataframe rows do.
+        staging_table = f"staging_{table_name}"
+        update_columns = [column for column in columns if column not in key_columns]
+        assignments = ", ".join(
+            f"{column} = staging.{column}" for column in update_columns
+        )
+        keys = " AND ".join(
+            f"target.{column} = staging.{column}" for column in key_columns
+        )
+        target = ", ".join(f"target.{column}" for column in update_columns)
+        staged = ", ".join(f"staging.{column}" for column in update_columns)
+
+        conn = self.engine.raw_connection()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(NO_STATEMENT_TIMEOUT)
+                cursor.execute(
+                    f"CREATE TEMP TABLE {staging_table} ON COMMIT DROP AS "
+                    f"SELECT {', '.join(columns)} FROM {table_name} WITH NO DATA"
+                )
+                self._copy_frames(cursor, frames, staging_table, columns, chunksize)
+                cursor.execute(
+                    f"UPDATE {table_name} AS target SET {assignments} "
+                    f"FROM {staging_table} AS staging WHERE {keys} "
+                    f"AND ({target}) IS DISTINCT FROM ({staged})"
+                )
+                rows = cursor.rowcount
+            conn.commit()
+            return rows
+        except psycopg2.Error as e:
+            conn.rollback()
+            raise RuntimeError(f"Update of {table_name} failed: {e}")
+        finally:
+            conn.close()
+
+    def _reflect_table(self, table_name: str) -> Table:
+        table = self._tables.get(table_name)
+        if table is not None:
+            return table
+        with self._reflect_lock:
+            if table_name not in self._tables:
+                self._tables[table_name] = Table(
+                    table_name, self.metadata, autoload_with=self.engine
+                )
+                self._insert_statements[table_name] = insert(
+                    self._tables[table_name]
+                )
+            return self._tables[table_name]
+
+    def _insert_statement(self, table_name: str):
+        self._reflect_table(table_name)
+        return self._insert_statements[table_name]
+
     def insert_dict(self, table_name: str, data: Dict[str, Any]) -> None:
         try:
-            table = Table(table_name, self.metadata, autoload_with=self.engine)
-            stmt = insert(table).values(**data)
             with self.engine.begin() as conn:
-                conn.execute(stmt)
+                conn.execute(self._insert_statement(table_name), data)
         except SQLAlchemyError as e:
             raise RuntimeError(f"Insert dict failed: {e}")
 
+    def insert_dicts(
+        self, table_name: str, rows: List[Dict[str, Any]], chunksize: int = 1000
+    ) -> None:
+        if not rows:
+            return
+        try:
+            stmt = self._insert_statement(table_name)
+            with self.engine.begin() as conn:
+                for start in range(0, len(rows), chunksize):
+                    conn.execute(stmt, rows[start : start + chunksize])
+        except SQLAlchemyError as e:
+            raise RuntimeError(f"Insert dicts failed: {e}")
+
+    def ensure_range_partitions(
+        self, table_name: str, start: date, end: date, interval: str = "year"
+    ) -> List[str]:
+        if interval not in ("year", "month"):
+            raise ValueError(f"Unsupported partition interval: {interval}")
+
+        partitions = []
+        lower = date(start.year, 1 if interval == "year" else start.month, 1)
+        while lower <= end:
+            if interval == "year":
+                upper = date(lower.year + 1, 1, 1)
+                name = f"{table_name}_y{lower:%Y}"
+            else:
+                upper = date(lower.year + lower.month // 12, lower.month % 12 + 1, 1)
+                name = f"{table_name}_m{lower:%Y%m}"
+            if name not in self._partitions:
+                partitions.append((name, lower, upper))
+            lower = upper
+
+        try:
+            with self.engine.begin() as conn:
+                for name, lower, upper in partitions:
+                    conn.execute(
+                        text(
+                            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF "
+                            f"{table_name} FOR VALUES FROM ('{lower}') TO ('{upper}')"
+                        )
+                    )
+        except SQLAlchemyError as e:
+            raise RuntimeError(f"Create partitions failed: {e}")
+
+        self._partitions.update(name for name, _, _ in partitions)
+        return [name for name, _, _ in partitions]
+
     def create_table(self, table_name: str, columns: List[Column]) -> None:
         try:
             table = Table(table_name, self.metadata, *columns)
@@ -0,0 +1,106 @@
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+
+_engines: Dict[Tuple[str, Tuple[Tuple[str, Any], ...]], Engine] = {}
+_engines_lock = threading.Lock()
+
+
+class PoolMetrics:
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self._lock = threading.Lock()
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+
+
+class MeteredQueuePool(QueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+
+def engine_options(
+    pool_size: int = DB_POOL_SIZE,
+    max_overflow: int = DB_MAX_OVERFLOW,
+    pool_timeout: float = DB_POOL_TIMEOUT,
+    pool_recycle: int = DB_POOL_RECYCLE,
+    statement_timeout_ms: int = DB_STATEMENT_TIMEOUT_MS,
+) -> Dict[str, Any]:
+    options: Dict[str, Any] = {
+        "poolclass": MeteredQueuePool,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": pool_timeout,
+        "pool_recycle": pool_recycle,
+        "pool_pre_ping": True,
+    }
+    if statement_timeout_ms:
+        options["connect_args"] = {
+            "options": f"-c statement_timeout={statement_timeout_ms}"
+        }
+    return options
+
+
+def get_engine(url: str, **overrides: Any) -> Engine:
+    url = make_url(url)
+    if url.drivername == "postgresql":
+        url = url.set(drivername="postgresql+psycopg2")
+
+    key = (url.render_as_string(hide_password=False), tuple(sorted(overrides.items())))
+    with _engines_lock:
+        if key not in _engines:
+            _engines[key] = create_engine(url, **engine_options(**overrides))
+        return _engines[key]
+
+
+def pool_metrics(engine: Engine) -> Dict[str, Any]:
+    pool = engine.pool
+    metrics: Optional[PoolMetrics] = getattr(pool, "metrics", None)
+    stats: Dict[str, Any] = {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+    }
+    if metrics:
+        stats.update(
+            {
+                "checkouts": metrics.checkouts,
+                "timeouts": metrics.timeouts,
+                "wait_seconds_total": round(metrics.wait_seconds_total, 6),
+                "wait_seconds_max": round(metrics.wait_seconds_max, 6),
+            }
+        )
+    return stats
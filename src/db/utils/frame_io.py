@@ -0,0 +1,51 @@
+import os
+import pandas as pd
+
+FORMAT_EXTENSIONS = {
+    "csv": ".csv",
+    "parquet": ".parquet",
+    "arrow": ".arrow",
+}
+
+PARQUET_COMPRESSION = "zstd"
+PARQUET_ROW_GROUP_SIZE = 100_000
+
+
+def infer_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    for output_format, format_extension in FORMAT_EXTENSIONS.items():
+        if extension == format_extension:
+            return output_format
+    return "csv"
+
+
+def with_format(path: str, output_format: str) -> str:
+    if output_format not in FORMAT_EXTENSIONS:
+        raise ValueError(f"Unsupported output format: {output_format}")
+    return os.path.splitext(path)[0] + FORMAT_EXTENSIONS[output_format]
+
+
+def write_frame(df: pd.DataFrame, path: str) -> str:
+    output_format = infer_format(path)
+    if output_format == "parquet":
+        df.to_parquet(
+            path,
+            index=False,
+            compression=PARQUET_COMPRESSION,
+            row_group_size=PARQUET_ROW_GROUP_SIZE,
+            write_statistics=True,
+        )
+    elif output_format == "arrow":
+        df.reset_index(drop=True).to_feather(path, compression=PARQUET_COMPRESSION)
+    else:
+        df.to_csv(path, index=False)
+    return path
+
+
+def read_frame(path: str, **kwargs) -> pd.DataFrame:
+    output_format = infer_format(path)
+    if output_format == "parquet":
+        return pd.read_parquet(path, **kwargs)
+    if output_format == "arrow":
+        return pd.read_feather(path, **kwargs)
+    return pd.read_csv(path, **kwargs)